@@ -0,0 +1,343 @@
+import base64
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control sketch accuracy / memory
+
+# HyperLogLog precision: 2^p registers, standard error ~ 1.04 / sqrt(2^p)
+# (p=14 -> 16 KB per sketch, ~0.8% error)
+HLL_PRECISION = 14
+
+# KLL accuracy parameter: rank error ~ 1.65 / k (k=200 -> ~0.8%)
+KLL_K = 200
+
+# Rows fed into a sketch at a time (each chunk is sketched then merged)
+SKETCH_CHUNK_ROWS = 1_000_000
+
+# Columns profiled in the validation report
+DISTINCT_COLUMNS = ['transaction_id', 'customer_id', 'merchant_id']
+QUANTILE_COLUMNS = ['amount_paise', 'fee_amount_paise', 'cashback_amount_paise']
+REPORT_QUANTILES = [0.5, 0.9, 0.99]
+
+SKETCH_FILE_NAME = "sketches.json"
+
+# ==================== HYPERLOGLOG ====================
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch (fixed 2^precision bytes of memory)"""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, values):
+        """Add an array of values (hashed with pandas' stable 64-bit hash)"""
+        hashes = pd.util.hash_array(np.asarray(values, dtype=object))
+        self.add_hashes(hashes)
+
+    def add_hashes(self, hashes):
+        """Add an array of uint64 hashes"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        remainder = hashes << np.uint64(p)
+
+        # Vectorized count of leading zeros in the remaining 64-p bits
+        leading_zeros = np.zeros(len(hashes), dtype=np.uint8)
+        for shift in (32, 16, 8, 4, 2, 1):
+            top_clear = (remainder >> np.uint64(64 - shift)) == 0
+            leading_zeros[top_clear] += shift
+            remainder[top_clear] <<= np.uint64(shift)
+        rank = np.minimum(leading_zeros + 1, 64 - p + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Merge another sketch of the same precision into this one"""
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HLL precision {other.precision} into {self.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        """Estimate the number of distinct values added"""
+        m = len(self.registers)
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zero_registers = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zero_registers > 0:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zero_registers)
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii'),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+# ==================== KLL QUANTILE SKETCH ====================
+
+class KLLSketch:
+    """Mergeable quantile sketch (Karnin-Lang-Liberty compactor hierarchy)"""
+
+    def __init__(self, k=KLL_K, seed=42):
+        self.k = k
+        self.compactors = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        # Adding a level shrinks the capacity of every level below it, so
+        # keep sweeping until the whole hierarchy fits
+        compacted = True
+        while compacted:
+            compacted = False
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) <= self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                items = np.sort(self.compactors[level])
+                # Odd item out stays behind so weights stay exact
+                if len(items) % 2 == 1:
+                    leftover, items = items[-1:], items[:-1]
+                else:
+                    leftover = items[:0]
+                offset = int(self._rng.integers(2))
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], items[offset::2]])
+                self.compactors[level] = leftover
+                compacted = True
+
+    def add(self, values):
+        """Add an array of numeric values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Merge another sketch into this one"""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Estimate the q-th quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        values = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(items), 2 ** level, dtype=np.float64)
+                                  for level, items in enumerate(self.compactors)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1])
+        return float(values[order][min(position, len(values) - 1)])
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'compactors': [items.tolist() for items in self.compactors],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.count = data['count']
+        if data['count']:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        sketch.compactors = [np.asarray(items, dtype=np.float64) for items in data['compactors']]
+        return sketch
+
+# ==================== SKETCH SETS (ONE PER DAY / RUN) ====================
+
+def build_sketch_set(df, chunk_rows=SKETCH_CHUNK_ROWS):
+    """Sketch one day's DataFrame chunk by chunk, merging chunk sketches"""
+    sketch_set = empty_sketch_set()
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        chunk_set = empty_sketch_set()
+        for column in DISTINCT_COLUMNS:
+            chunk_set['distinct'][column].add(chunk[column].to_numpy())
+        for column in QUANTILE_COLUMNS:
+            chunk_set['quantiles'][column].add(chunk[column].to_numpy())
+        merge_sketch_sets(sketch_set, chunk_set)
+    return sketch_set
+
+def empty_sketch_set():
+    return {
+        'distinct': {column: HyperLogLog() for column in DISTINCT_COLUMNS},
+        'quantiles': {column: KLLSketch() for column in QUANTILE_COLUMNS},
+    }
+
+def merge_sketch_sets(target, other):
+    """Merge other into target (across chunks, days or runs)"""
+    for column, sketch in other['distinct'].items():
+        target['distinct'].setdefault(column, HyperLogLog(sketch.precision)).merge(sketch)
+    for column, sketch in other['quantiles'].items():
+        target['quantiles'].setdefault(column, KLLSketch(sketch.k)).merge(sketch)
+    return target
+
+def summarize_sketch_set(sketch_set):
+    """Flatten a sketch set into plain numbers for reports"""
+    summary = {}
+    for column, sketch in sketch_set['distinct'].items():
+        summary[f"approx_distinct_{column}"] = sketch.count()
+    for column, sketch in sketch_set['quantiles'].items():
+        for q in REPORT_QUANTILES:
+            summary[f"{column}_p{int(q * 100)}"] = sketch.quantile(q)
+        summary[f"{column}_min"] = sketch.min if sketch.count else None
+        summary[f"{column}_max"] = sketch.max if sketch.count else None
+    return summary
+
+def format_sketch_summary(sketch_set):
+    """Return report lines for a sketch set"""
+    lines = []
+    for column, sketch in sketch_set['distinct'].items():
+        lines.append(f"Approx unique {column}: {sketch.count():,}")
+    for column, sketch in sketch_set['quantiles'].items():
+        if sketch.count == 0:
+            lines.append(f"{column}: no values")
+            continue
+        # Money columns are sketched in paise and shown in rupees
+        label, scale = (column[:-len('_paise')] + " (₹)", 0.01) if column.endswith('_paise') else (column, 1)
+        quantiles = ", ".join(f"p{int(q * 100)}={sketch.quantile(q) * scale:,.2f}" for q in REPORT_QUANTILES)
+        lines.append(f"{label}: min={sketch.min * scale:,.2f}, {quantiles}, max={sketch.max * scale:,.2f}")
+    return lines
+
+def save_sketches(path, day_sketch_sets):
+    """Save per-day sketch sets (keyed by day label) as JSON"""
+    payload = {
+        day: {
+            'distinct': {column: sketch.to_dict() for column, sketch in sketch_set['distinct'].items()},
+            'quantiles': {column: sketch.to_dict() for column, sketch in sketch_set['quantiles'].items()},
+        }
+        for day, sketch_set in day_sketch_sets.items()
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+def load_sketches(path):
+    """Load per-day sketch sets saved by save_sketches()"""
+    with open(path, 'r', encoding='utf-8') as f:
+        payload = json.load(f)
+    return {
+        day: {
+            'distinct': {column: HyperLogLog.from_dict(data) for column, data in sketch_set['distinct'].items()},
+            'quantiles': {column: KLLSketch.from_dict(data) for column, data in sketch_set['quantiles'].items()},
+        }
+        for day, sketch_set in payload.items()
+    }
+
+# ==================== DRIFT COMPARISON ====================
+
+def compare_sketch_sets(base, current):
+    """Return {metric: (base, current, pct_change)} between two sketch sets"""
+    base_summary = summarize_sketch_set(base)
+    current_summary = summarize_sketch_set(current)
+    drift = {}
+    for metric, base_value in base_summary.items():
+        current_value = current_summary.get(metric)
+        if base_value is None or current_value is None:
+            continue
+        pct_change = (current_value - base_value) / base_value * 100 if base_value else None
+        drift[metric] = (base_value, current_value, pct_change)
+    return drift
+
+def print_drift(title, drift):
+    print(f"\n=== {title} ===")
+    for metric, (base_value, current_value, pct_change) in drift.items():
+        change = f"{pct_change:+.1f}%" if pct_change is not None else "n/a"
+        print(f"{metric:<32} {base_value:>14,.2f} -> {current_value:>14,.2f} ({change})")
+
+# ==================== MAIN EXECUTION ====================
+
+def main(folders):
+    """Merge and compare sketches across the days of one or more generator runs"""
+    print("="*70)
+    print("📐 SKETCH-BASED PROFILE (HyperLogLog + KLL)")
+    print("="*70)
+
+    runs = []
+    for folder in folders:
+        path = os.path.join(folder, SKETCH_FILE_NAME)
+        if not os.path.exists(path):
+            print(f"❌ {path} not found (generate the run with Incremental_Data_Generator.py)")
+            return 1
+        runs.append((os.path.basename(os.path.normpath(folder)), load_sketches(path)))
+
+    run_totals = []
+    for run_name, day_sketch_sets in runs:
+        print(f"\n📂 {run_name}")
+        days = sorted(day_sketch_sets)
+        for previous_day, day in zip(days, days[1:]):
+            print_drift(f"{previous_day} -> {day}",
+                        compare_sketch_sets(day_sketch_sets[previous_day], day_sketch_sets[day]))
+
+        total = empty_sketch_set()
+        for sketch_set in day_sketch_sets.values():
+            merge_sketch_sets(total, sketch_set)
+        run_totals.append((run_name, total))
+        print(f"\n=== ALL DAYS MERGED ===")
+        for line in format_sketch_summary(total):
+            print(line)
+
+    for (base_name, base_total), (run_name, run_total) in zip(run_totals, run_totals[1:]):
+        print_drift(f"RUN DRIFT: {base_name} -> {run_name}", compare_sketch_sets(base_total, run_total))
+
+    print("\n" + "="*70)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python Approx_Sketches.py <run_folder> [<run_folder> ...]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,372 @@
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+import Incremental_Data_Generator as gen
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control the benchmark run
+
+# Rows per call; each helper is timed at every size up to MAX_BATCH_ROWS
+BATCH_SIZES = [1, 100, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Largest size timed unless --max-rows N is passed (a 10M-row batch holds
+# several arrays of 10M values at once - GBs for the string helpers)
+MAX_BATCH_ROWS = 1_000_000
+
+# The scalar (per-row) helpers are skipped above this size - they would
+# take minutes and the ns/row figure is flat by then anyway
+SCALAR_MAX_ROWS = 100_000
+
+# Small batches are repeated until at least this many rows were timed
+MIN_ROWS_PER_TIMING = 20_000
+
+# Repeats per measurement; the median and interquartile range are reported
+REPEATS = 11
+
+# Rows drawn from each implementation for the distribution checks
+DISTRIBUTION_SAMPLE_ROWS = 100_000
+
+# Two-sample Kolmogorov-Smirnov critical coefficient (alpha = 0.001)
+KS_ALPHA_COEFFICIENT = 1.949
+
+# A helper fails when its median gets this much slower than the saved
+# baseline's, plus NOISE_SIGMAS standard errors of the difference of the two
+# medians (estimated from each run's interquartile range and REPEATS)
+REGRESSION_THRESHOLD = 0.10
+NOISE_SIGMAS = 3.0
+
+# Smaller batches are timed and printed but not gated: per-call overhead
+# dominates them and their ns/row swings with the machine's state
+GATE_MIN_ROWS = 10_000
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Baseline format: median/IQR timings of the generator's own batch code
+# (baselines without it timed best-of-N runs or benchmark-local copies)
+BASELINE_FORMAT = 'median_iqr_generator'
+
+USAGE = "Usage: python Benchmark_Hot_Paths.py [--save-baseline] [--max-rows N]"
+
+# ==================== INPUTS ====================
+# The batch side of every benchmark is the generator's own vectorized code
+# (counter mode: *_from_uniforms, the master data store), fed by the same
+# counter_uniforms() streams generate_day_slice() reads. The draws come from
+# Philox rather than random / np.random, so batch and scalar outputs are
+# statistically (not bit-for-bit) equivalent.
+
+def uniforms(field, n, draws_per_row=1):
+    """Day 1 counter uniforms of a field for rows [0, n)"""
+    return gen.counter_uniforms(1, field, 0, n, draws_per_row)
+
+def random_amounts(n):
+    return gen.amounts_from_uniforms(np.random.random((n, 2)))
+
+def random_statuses(n):
+    return gen.weighted_choices_from_uniforms(gen.TRANSACTION_STATUSES, np.random.random(n))
+
+def random_merchant_indexes(n):
+    return np.random.randint(0, gen.NUM_MERCHANTS, n)
+
+def random_customer_indexes(n):
+    return np.random.randint(0, gen.NUM_CUSTOMERS, n)
+
+def scalar_products(n):
+    """Category then product, drawn as the sequential day loops draw them"""
+    category_products = gen.get_master_data().row_pools()[3]
+    products = []
+    for _ in range(n):
+        category, names = random.choice(category_products)
+        products.append(random.choice(names))
+    return products
+
+def seconds_since_midnight(timestamps):
+    """Map datetimes / datetime64 values to seconds since midnight (for KS tests)"""
+    values = np.asarray(timestamps, dtype='datetime64[s]').astype(np.int64)
+    return values % 86400
+
+# ==================== BENCHMARK DEFINITIONS ====================
+# Each benchmark has:
+#   make_inputs(n) -> inputs shared by both implementations
+#   scalar(inputs, n) / batch(inputs, n) -> outputs
+#   check: 'ks' (continuous distribution), 'categorical' (category mix)
+#          or 'exact' (deterministic, outputs must match)
+#   to_numeric(outputs) -> numbers fed to the KS test (ks/categorical only)
+
+BENCHMARKS = {
+    'generate_amount': {
+        'make_inputs': lambda n: None,
+        'scalar': lambda inputs, n: [gen.generate_amount() for _ in range(n)],
+        'batch': lambda inputs, n: gen.amounts_from_uniforms(uniforms('amount', n, 2)),
+        'check': 'ks',
+    },
+    'calculate_fee': {
+        'make_inputs': random_amounts,
+        'scalar': lambda amounts, n: [gen.calculate_fee(a) for a in amounts.tolist()],
+        'batch': lambda amounts, n: gen.fees_from_uniforms(amounts, uniforms('fee', n)),
+        'check': 'ks',
+    },
+    'calculate_cashback': {
+        'make_inputs': lambda n: (random_amounts(n), random_statuses(n)),
+        'scalar': lambda inputs, n: [gen.calculate_cashback(a, s) for a, s in zip(inputs[0].tolist(), inputs[1].tolist())],
+        'batch': lambda inputs, n: gen.cashbacks_from_uniforms(inputs[0], inputs[1] == 'Successful',
+                                                               uniforms('cashback', n)),
+        'check': 'ks',
+    },
+    'calculate_loyalty_points': {
+        'make_inputs': lambda n: (random_amounts(n), random_statuses(n)),
+        'scalar': lambda inputs, n: [gen.calculate_loyalty_points(a, s) for a, s in zip(inputs[0].tolist(), inputs[1].tolist())],
+        'batch': lambda inputs, n: gen.loyalty_points_from_uniforms(inputs[0], inputs[1] == 'Successful',
+                                                                    uniforms('loyalty', n)),
+        'check': 'ks',
+    },
+    'weighted_random_choice': {
+        'make_inputs': lambda n: None,
+        'scalar': lambda inputs, n: [gen.weighted_random_choice(gen.PAYMENT_METHODS) for _ in range(n)],
+        'batch': lambda inputs, n: gen.weighted_choices_from_uniforms(gen.PAYMENT_METHODS, uniforms('payment_method', n)),
+        'check': 'categorical',
+    },
+    'get_random_timestamp': {
+        'make_inputs': lambda n: None,
+        'scalar': lambda inputs, n: [gen.get_random_timestamp(gen.DAY1_DATE) for _ in range(n)],
+        'batch': lambda inputs, n: gen.timestamps_from_uniforms(gen.DAY1_DATE, uniforms('timestamp', n)),
+        'check': 'ks',
+        'to_numeric': seconds_since_midnight,
+    },
+    'product_choice': {
+        'make_inputs': lambda n: None,
+        'scalar': lambda inputs, n: scalar_products(n),
+        'batch': lambda inputs, n: gen.products_from_uniforms(uniforms('category', n), uniforms('product', n))[1],
+        'check': 'categorical',
+    },
+    'get_merchant_name': {
+        'make_inputs': random_merchant_indexes,
+        'scalar': lambda indexes, n: [gen.get_merchant_name(i) for i in indexes.tolist()],
+        'batch': lambda indexes, n: gen.get_master_data().merchant_names_at(indexes),
+        'check': 'exact',
+    },
+    'generate_transaction_id': {
+        'make_inputs': lambda n: np.arange(1, n + 1),
+        'scalar': lambda seqs, n: [gen.generate_transaction_id(gen.DAY1_DATE, seq) for seq in seqs.tolist()],
+        'batch': lambda seqs, n: gen.generate_transaction_ids(gen.DAY1_DATE, seqs),
+        'check': 'exact',
+    },
+    'generate_customer_id': {
+        'make_inputs': random_customer_indexes,
+        'scalar': lambda indexes, n: [gen.generate_customer_id(i + 1) for i in indexes.tolist()],
+        'batch': lambda indexes, n: gen.get_master_data().customer_ids_at(indexes),
+        'check': 'exact',
+    },
+    'generate_merchant_id': {
+        'make_inputs': random_merchant_indexes,
+        'scalar': lambda indexes, n: [gen.generate_merchant_id(i + 1) for i in indexes.tolist()],
+        'batch': lambda indexes, n: gen.get_master_data().merchant_ids_at(indexes),
+        'check': 'exact',
+    },
+}
+
+# ==================== TIMING ====================
+
+def time_ns_per_row(func, inputs, n):
+    """ns/row of one timed run of func(inputs, n), looping small batches"""
+    loops = max(1, MIN_ROWS_PER_TIMING // n)
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        func(inputs, n)
+    return (time.perf_counter_ns() - start) / (loops * n)
+
+def summarize(samples):
+    """{'median_ns', 'iqr_ns'} of a helper's timed runs"""
+    q1, median, q3 = np.percentile(samples, [25, 50, 75])
+    return {'median_ns': float(median), 'iqr_ns': float(q3 - q1)}
+
+def run_timings(batch_sizes):
+    """Return {benchmark: {batch_size: {'scalar': timing, 'batch': timing}}}
+
+    Repeats are interleaved: each round times every helper once at a batch
+    size, so a slow spell on the machine widens every helper's IQR instead of
+    shifting one helper's median.
+    """
+    results = {name: {} for name in BENCHMARKS}
+    for n in batch_sizes:
+        inputs = {name: bench['make_inputs'](n) for name, bench in BENCHMARKS.items()}
+        impls = ['scalar', 'batch'] if n <= SCALAR_MAX_ROWS else ['batch']
+        samples = {(name, impl): [] for name in BENCHMARKS for impl in impls}
+        for _ in range(REPEATS):
+            for (name, impl), times in samples.items():
+                times.append(time_ns_per_row(BENCHMARKS[name][impl], inputs[name], n))
+        for (name, impl), times in samples.items():
+            results[name].setdefault(str(n), {})[impl] = summarize(times)
+    return results
+
+# ==================== DISTRIBUTION CHECKS ====================
+
+def ks_statistic(a, b):
+    """Two-sample Kolmogorov-Smirnov statistic"""
+    a = np.sort(np.asarray(a, dtype=np.float64))
+    b = np.sort(np.asarray(b, dtype=np.float64))
+    grid = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, grid, side='right') / len(a)
+    cdf_b = np.searchsorted(b, grid, side='right') / len(b)
+    return float(np.max(np.abs(cdf_a - cdf_b)))
+
+def check_equivalence(name, bench, n=DISTRIBUTION_SAMPLE_ROWS):
+    """Compare scalar vs batch outputs, returns (passed, detail)"""
+    inputs = bench['make_inputs'](n)
+    scalar_out = bench['scalar'](inputs, n)
+    batch_out = bench['batch'](inputs, n)
+
+    if bench['check'] == 'exact':
+        mismatches = int(np.sum(np.asarray(scalar_out, dtype=object) != np.asarray(batch_out, dtype=object)))
+        return mismatches == 0, f"{mismatches:,} mismatches"
+
+    if bench['check'] == 'categorical':
+        categories = sorted(set(scalar_out) | set(np.asarray(batch_out).tolist()))
+        codes = {category: i for i, category in enumerate(categories)}
+        scalar_num = [codes[value] for value in scalar_out]
+        batch_num = [codes[value] for value in np.asarray(batch_out).tolist()]
+    else:
+        to_numeric = bench.get('to_numeric', lambda values: np.asarray(values, dtype=np.float64))
+        scalar_num = to_numeric(scalar_out)
+        batch_num = to_numeric(batch_out)
+
+    statistic = ks_statistic(scalar_num, batch_num)
+    critical = KS_ALPHA_COEFFICIENT * np.sqrt(2.0 / n)
+    return statistic <= critical, f"KS D={statistic:.4f} (critical {critical:.4f})"
+
+# ==================== BASELINES ====================
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baseline(results, path=BASELINE_PATH):
+    payload = {
+        'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'format': BASELINE_FORMAT,
+        'machine': f"{platform.node()} ({platform.processor() or platform.machine()}, Python {platform.python_version()})",
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2)
+
+def median_standard_error(timing, repeats=REPEATS):
+    """Standard error of a median of repeats runs (normal approximation: sigma = IQR / 1.349)"""
+    return 1.2533 * (timing['iqr_ns'] / 1.349) / np.sqrt(repeats)
+
+def find_regressions(results, baseline, threshold=REGRESSION_THRESHOLD, noise_sigmas=NOISE_SIGMAS,
+                     min_rows=GATE_MIN_ROWS):
+    """Return [(benchmark, batch_size, impl, baseline_ns, current_ns)] slower than the noise-aware limit
+
+    The limit is the baseline median * (1 + threshold) plus noise_sigmas
+    standard errors of the difference between the two medians, so a noisy
+    helper needs a larger slowdown to fail. Sizes below min_rows are not gated.
+    """
+    regressions = []
+    for name, sizes in results.items():
+        for n, row in sizes.items():
+            if int(n) < min_rows:
+                continue
+            for impl, current in row.items():
+                base = baseline['results'].get(name, {}).get(n, {}).get(impl)
+                if not base:
+                    continue
+                noise_ns = np.hypot(median_standard_error(base), median_standard_error(current))
+                limit = base['median_ns'] * (1 + threshold) + noise_sigmas * noise_ns
+                if current['median_ns'] > limit:
+                    regressions.append((name, n, impl, base['median_ns'], current['median_ns']))
+    return regressions
+
+# ==================== MAIN EXECUTION ====================
+
+def parse_args(argv):
+    """Return (save_baseline, max_rows), or None when argv is not valid"""
+    save_baseline, max_rows = False, MAX_BATCH_ROWS
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == '--save-baseline':
+            save_baseline = True
+        elif arg == '--max-rows' and args and args[0].isdigit() and int(args[0]) > 0:
+            max_rows = int(args.pop(0))
+        else:
+            return None
+    return save_baseline, max_rows
+
+def main(argv):
+    """Run the hot-path microbenchmarks (--save-baseline records a new baseline, --max-rows N caps the sizes)"""
+    options = parse_args(argv)
+    if options is None:
+        print(USAGE)
+        return 2
+    save_baseline_requested, max_rows = options
+    batch_sizes = [n for n in BATCH_SIZES if n <= max_rows]
+
+    print("="*70)
+    print("⏱️  GENERATOR HOT-PATH MICROBENCHMARKS")
+    print("="*70)
+    print(f"Batch sizes: {', '.join(f'{n:,}' for n in batch_sizes)} ({REPEATS} repeats, median)")
+
+    random.seed(42)
+    np.random.seed(42)
+
+    print("\n" + "="*70)
+    print("🧪 STATISTICAL EQUIVALENCE (scalar vs batch)")
+    print("="*70)
+    equivalence_ok = True
+    for name, bench in BENCHMARKS.items():
+        passed, detail = check_equivalence(name, bench)
+        equivalence_ok &= passed
+        print(f"{'✅' if passed else '❌'} {name:<26} {bench['check']:<12} {detail}")
+
+    print("\n" + "="*70)
+    print("📊 MEDIAN NS PER ROW (scalar | batch | speedup)")
+    print("="*70)
+    results = run_timings(batch_sizes)
+    for name, sizes in results.items():
+        print(f"\n{name}")
+        for n, row in sizes.items():
+            scalar_ns = row['scalar']['median_ns'] if 'scalar' in row else None
+            batch_ns = row['batch']['median_ns']
+            scalar_str = f"{scalar_ns:>10,.1f}" if scalar_ns is not None else f"{'-':>10}"
+            speedup = f"{scalar_ns / batch_ns:>8,.1f}x" if scalar_ns is not None else f"{'-':>9}"
+            print(f"  {int(n):>12,} rows: {scalar_str} | {batch_ns:>10,.1f} | {speedup}")
+
+    regressions_ok = True
+    if save_baseline_requested:
+        save_baseline(results)
+        print(f"\n💾 Baseline saved to {BASELINE_PATH}")
+    else:
+        baseline = load_baseline()
+        if baseline is None:
+            print(f"\n⚠️  No baseline at {BASELINE_PATH} (run with --save-baseline to create one)")
+        elif baseline.get('format') != BASELINE_FORMAT:
+            print(f"\n⚠️  Baseline at {BASELINE_PATH} was recorded by an older benchmark "
+                  f"(run with --save-baseline to re-record it)")
+        else:
+            print("\n" + "="*70)
+            print(f"📉 REGRESSION CHECK (median > {REGRESSION_THRESHOLD*100:.0f}% + {NOISE_SIGMAS:g} SE slower than "
+                  f"baseline from {baseline['saved_at']}, {GATE_MIN_ROWS:,}+ rows)")
+            print("="*70)
+            regressions = find_regressions(results, baseline)
+            for name, n, impl, baseline_ns, current_ns in regressions:
+                print(f"❌ {name} [{impl}, {int(n):,} rows]: {baseline_ns:,.1f} -> {current_ns:,.1f} ns/row "
+                      f"(+{(current_ns / baseline_ns - 1) * 100:.0f}%)")
+            regressions_ok = not regressions
+            if regressions_ok:
+                print("✅ No regressions")
+
+    print("\n" + "="*70)
+    return 0 if equivalence_ok and regressions_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,273 @@
+import glob
+import hashlib
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control the load
+
+# Local warehouse stand-in (DuckDB database file)
+DUCKDB_PATH = "payment_gateway_local.duckdb"
+
+# Files loaded concurrently (one pooled connection per worker)
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+BRONZE_SCHEMA = "payment_gateway_bronze"
+LOAD_LOG_TABLE = f"{BRONZE_SCHEMA}.load_log"
+
+# Read size for content hashing
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Generator output file patterns -> bronze table (day files and any shards,
+# e.g. day1_transactions_part003.csv / .parquet, plus the versioned master data)
+FILE_PATTERNS = {
+    'raw_transactions': ["day*_transactions.csv", "day*_transactions_*.csv",
+                         "day*_transactions.parquet", "day*_transactions_*.parquet"],
+    'raw_transaction_updates': ["day*_transaction_updates.csv", "day*_transaction_updates_*.csv",
+                                "day*_transaction_updates.parquet", "day*_transaction_updates_*.parquet"],
+    'raw_customers': ["customers.csv", "customers.parquet"],
+    'raw_merchants': ["merchants.csv", "merchants.parquet"],
+    'raw_customers_delta': ["day*_customers_delta.csv", "day*_customers_delta.parquet"],
+    'raw_merchants_delta': ["day*_merchants_delta.csv", "day*_merchants_delta.parquet"],
+}
+
+# ==================== CONNECTION POOL ====================
+
+class ConnectionPool:
+    """Fixed-size pool of DuckDB connections to one database file
+
+    DuckDB allows one read-write handle per file per process, so the pool
+    opens it once and hands out cursors (independent connections sharing
+    that database) to the worker threads.
+    """
+
+    def __init__(self, path, size):
+        import duckdb
+        self._root = duckdb.connect(path)
+        self._idle = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._root.cursor())
+
+    def acquire(self):
+        return self._idle.get()
+
+    def release(self, connection):
+        self._idle.put(connection)
+
+    @property
+    def root(self):
+        return self._root
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get().close()
+        self._root.close()
+
+# ==================== DISCOVERY & BOOKKEEPING ====================
+# A file is identified by its name (day1_transactions.csv, ...), not its
+# path, and counts as unchanged when its size and SHA-256 match the load log.
+# A copied, moved or renamed output folder is therefore skipped, and a file
+# with the same name but new content replaces the rows it loaded before -
+# including one from a different generator run. The hash is only computed
+# when size or modification time differ from the log, so an untouched file
+# is skipped without being read.
+
+def discover_files(folder):
+    """Return [(table, path)] for every day file / shard in a generator output folder"""
+    files = []
+    for table, patterns in FILE_PATTERNS.items():
+        paths = set()
+        for pattern in patterns:
+            paths.update(glob.glob(os.path.join(folder, pattern)))
+        files.extend((table, os.path.abspath(path)) for path in sorted(paths))
+    return files
+
+def file_sha256(path):
+    """Hex SHA-256 of a file's content, read in HASH_CHUNK_BYTES chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def sql_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+def scan_expression(path):
+    """Native bulk reader for a file (DuckDB's parallel CSV / Parquet scanners)"""
+    if path.endswith(".parquet"):
+        return f"read_parquet({sql_literal(path)})"
+    return f"read_csv({sql_literal(path)}, header = true)"
+
+def prepare_warehouse(connection, files):
+    """Create schema, load log and bronze tables (serially, before the parallel load)"""
+    connection.execute(f"CREATE SCHEMA IF NOT EXISTS {BRONZE_SCHEMA}")
+    connection.execute(f"""
+        CREATE TABLE IF NOT EXISTS {LOAD_LOG_TABLE} (
+            file_name VARCHAR PRIMARY KEY,
+            table_name VARCHAR,
+            file_path VARCHAR,
+            file_size BIGINT,
+            content_sha256 VARCHAR,
+            file_mtime_ns BIGINT,
+            rows_loaded BIGINT,
+            load_seconds DOUBLE,
+            loaded_at TIMESTAMP
+        )
+    """)
+    log_columns = {row[0] for row in connection.execute(f"DESCRIBE {LOAD_LOG_TABLE}").fetchall()}
+    if 'content_sha256' not in log_columns:
+        raise RuntimeError(f"{LOAD_LOG_TABLE} was written by an older loader (keyed on file path); "
+                           f"delete {DUCKDB_PATH} and load again")
+    if 'file_mtime_ns' not in log_columns:
+        # Logs written before the mtime fast path: hashed once more on the next load
+        connection.execute(f"ALTER TABLE {LOAD_LOG_TABLE} ADD COLUMN file_mtime_ns BIGINT")
+    # Each table takes its schema from the first file that feeds it
+    for table in dict.fromkeys(table for table, _ in files):
+        first_path = next(path for t, path in files if t == table)
+        connection.execute(f"""
+            CREATE TABLE IF NOT EXISTS {BRONZE_SCHEMA}.{table} AS
+            SELECT *, ''::VARCHAR AS _source_file, now()::TIMESTAMP AS _loaded_at
+            FROM {scan_expression(first_path)}
+            LIMIT 0
+        """)
+
+def logged_file(connection, file_name):
+    """Return (file_size, content_sha256, file_mtime_ns) from the load log, or None"""
+    return connection.execute(
+        f"SELECT file_size, content_sha256, file_mtime_ns FROM {LOAD_LOG_TABLE} WHERE file_name = ?", [file_name]
+    ).fetchone()
+
+# ==================== LOADING ====================
+
+def load_file(pool, table, path):
+    """Bulk-load one file in a single transaction, returns a per-file result dict"""
+    file_name = os.path.basename(path)
+    stat = os.stat(path)
+    size, mtime_ns = stat.st_size, stat.st_mtime_ns
+    connection = pool.acquire()
+    try:
+        logged = logged_file(connection, file_name)
+        if logged is not None and logged[0] == size and logged[2] == mtime_ns:
+            return {'path': path, 'table': table, 'status': 'skipped'}
+
+        sha256 = file_sha256(path)
+        previously_loaded = logged is not None
+        if previously_loaded and logged[0] == size and logged[1] == sha256:
+            # Same content under a new mtime (copied / moved folder): remember it, don't reload
+            connection.execute(f"UPDATE {LOAD_LOG_TABLE} SET file_path = ?, file_mtime_ns = ? WHERE file_name = ?",
+                               [path, mtime_ns, file_name])
+            return {'path': path, 'table': table, 'status': 'skipped'}
+
+        start = time.perf_counter()
+        connection.execute("BEGIN TRANSACTION")
+        try:
+            if previously_loaded:
+                # File changed since its last load: replace its rows
+                connection.execute(f"DELETE FROM {BRONZE_SCHEMA}.{table} WHERE _source_file = ?", [file_name])
+            rows = connection.execute(f"""
+                INSERT INTO {BRONZE_SCHEMA}.{table} BY NAME
+                SELECT *, {sql_literal(file_name)} AS _source_file, now()::TIMESTAMP AS _loaded_at
+                FROM {scan_expression(path)}
+            """).fetchone()[0]
+            seconds = time.perf_counter() - start
+            connection.execute(f"""
+                INSERT OR REPLACE INTO {LOAD_LOG_TABLE} (file_name, table_name, file_path, file_size,
+                    content_sha256, file_mtime_ns, rows_loaded, load_seconds, loaded_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, now()::TIMESTAMP)
+            """, [file_name, table, path, size, sha256, mtime_ns, rows, seconds])
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        return {
+            'path': path,
+            'table': table,
+            'status': 'reloaded' if previously_loaded else 'loaded',
+            'rows': rows,
+            'bytes': size,
+            'seconds': seconds,
+        }
+    finally:
+        pool.release(connection)
+
+def load_folder(folder, database_path=DUCKDB_PATH, max_workers=MAX_WORKERS):
+    """Load every day file / shard of a generator output folder concurrently"""
+    files = discover_files(folder)
+    if not files:
+        raise FileNotFoundError(f"No generator output files (day*_transactions, master data, ...) in {folder}")
+
+    pool = ConnectionPool(database_path, max_workers)
+    try:
+        prepare_warehouse(pool.root, files)
+        results = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(load_file, pool, table, path) for table, path in files]
+            for future in as_completed(futures):
+                results.append(future.result())
+        wall_seconds = time.perf_counter() - start
+    finally:
+        pool.close()
+    return results, wall_seconds
+
+# ==================== MAIN EXECUTION ====================
+
+def main(folder):
+    """Bulk-load a generator output folder into the local bronze layer"""
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        print("❌ duckdb is not installed (pip install duckdb)")
+        return 1
+
+    print("="*70)
+    print("📥 BRONZE BULK LOADER (DuckDB stand-in)")
+    print("="*70)
+    print(f"\n📂 Folder: {folder}")
+    print(f"Database: {DUCKDB_PATH}")
+    print(f"Workers: {MAX_WORKERS}")
+
+    results, wall_seconds = load_folder(folder)
+
+    print("\n" + "="*70)
+    print("📊 PER-FILE THROUGHPUT")
+    print("="*70)
+    total_rows = 0
+    total_bytes = 0
+    for result in sorted(results, key=lambda r: r['path']):
+        name = os.path.basename(result['path'])
+        if result['status'] == 'skipped':
+            print(f"⏭️  {name} -> {result['table']}: already loaded, skipped")
+            continue
+        total_rows += result['rows']
+        total_bytes += result['bytes']
+        mb = result['bytes'] / (1024 * 1024)
+        seconds = max(result['seconds'], 1e-9)  # Tiny files can load within the timer's resolution
+        print(f"✅ {name} -> {result['table']} ({result['status']}): {result['rows']:,} rows, "
+              f"{mb:.2f}MB in {result['seconds']:.2f}s "
+              f"({result['rows'] / seconds:,.0f} rows/s, {mb / seconds:.1f} MB/s)")
+
+    print("\n" + "="*70)
+    print("📈 SUMMARY")
+    print("="*70)
+    print(f"Files discovered: {len(results)}")
+    print(f"Files loaded: {sum(r['status'] != 'skipped' for r in results)}")
+    print(f"Files skipped (unchanged): {sum(r['status'] == 'skipped' for r in results)}")
+    print(f"Rows loaded: {total_rows:,}")
+    if total_rows:
+        print(f"Aggregate throughput: {total_rows / wall_seconds:,.0f} rows/s, "
+              f"{total_bytes / (1024 * 1024) / wall_seconds:.1f} MB/s ({wall_seconds:.2f}s wall)")
+    print("\n" + "="*70)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python Bronze_Bulk_Loader.py <generator_output_folder>")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1]))
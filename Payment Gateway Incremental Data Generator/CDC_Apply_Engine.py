@@ -0,0 +1,151 @@
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control the apply run
+
+# Change events applied per batch
+BATCH_SIZE = 100_000
+
+# Columns each layer takes from a CDC after-image
+SILVER_UPDATE_COLUMNS = ['transaction_status', 'cashback_amount_paise', 'loyalty_points', 'updated_at']
+FACT_UPDATE_COLUMNS = ['transaction_status', 'cashback_amount_paise', 'loyalty_points', 'is_refunded',
+                       'refund_amount_paise', 'refund_date', 'attempt_number', 'updated_at']
+
+# ==================== LOADING ====================
+
+def load_silver(folder):
+    """Load every dayN_transactions.csv into one silver frame keyed by transaction_id"""
+    paths = sorted(glob.glob(os.path.join(folder, "day*_transactions.csv")))
+    if not paths:
+        raise FileNotFoundError(f"No day*_transactions.csv files in {folder}")
+    silver = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    silver['updated_at'] = pd.to_datetime(silver['updated_at'])
+    return silver.set_index('transaction_id')
+
+def build_fact(silver):
+    """Derive fact measures and mutable flags the way 04_gold_fact_transactions.sql does"""
+    fact = silver[['amount_paise', 'fee_amount_paise', 'cashback_amount_paise', 'loyalty_points',
+                   'transaction_status', 'updated_at']].copy()
+    derive_measures(fact)
+    fact['is_refunded'] = False
+    fact['refund_amount_paise'] = pd.array([pd.NA] * len(fact), dtype='Int64')
+    fact['refund_date'] = pd.NaT
+    fact['attempt_number'] = 1
+    return fact
+
+def derive_measures(fact):
+    """(Re)compute the derived paise measures in place (cashback changes with status)"""
+    # Integer paise arithmetic: exact, no per-row rounding
+    fact['net_customer_amount_paise'] = fact['amount_paise'] - fact['cashback_amount_paise']
+    fact['merchant_net_amount_paise'] = fact['amount_paise'] - fact['fee_amount_paise']
+    fact['gateway_revenue_paise'] = fact['fee_amount_paise'] - fact['cashback_amount_paise']
+
+def load_change_log(folder):
+    """Load every dayN_transaction_updates.csv in delivery (file) order"""
+    paths = sorted(glob.glob(os.path.join(folder, "day*_transaction_updates.csv")))
+    if not paths:
+        raise FileNotFoundError(f"No day*_transaction_updates.csv files in {folder}")
+    log = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+    log['updated_at'] = pd.to_datetime(log['updated_at'])
+    log['refund_date'] = pd.to_datetime(log['refund_date'])
+    log['refund_amount_paise'] = log['refund_amount_paise'].astype('Int64')
+    return log
+
+# ==================== COMPACTION & APPLY ====================
+
+def compact_change_log(log):
+    """Keep only the latest event per transaction_id (last-writer-wins by updated_at)
+
+    Ties on updated_at keep the event delivered last, which also collapses
+    duplicate deliveries of the same event.
+    """
+    ordered = log.sort_values('updated_at', kind='stable')
+    return ordered.drop_duplicates(subset='transaction_id', keep='last').set_index('transaction_id')
+
+def apply_batch(target, batch, columns):
+    """Apply one compacted batch to target in place, returns (applied, stale, orphan)"""
+    known = batch.index.isin(target.index)
+    orphan = int((~known).sum())
+    batch = batch[known]
+
+    # Last-writer-wins against the target too: never overwrite a newer row
+    current_updated_at = target.loc[batch.index, 'updated_at']
+    newer = current_updated_at.isna().to_numpy() | (batch['updated_at'].to_numpy() > current_updated_at.to_numpy())
+    stale = int((~newer).sum())
+    batch = batch[newer]
+
+    target.loc[batch.index, columns] = batch[columns].to_numpy()
+    return len(batch), stale, orphan
+
+def apply_in_batches(target, compacted, columns, batch_size=BATCH_SIZE):
+    """Apply a compacted change log in batches, returns totals and elapsed seconds"""
+    totals = {'applied': 0, 'stale': 0, 'orphan': 0}
+    start = time.perf_counter()
+    for offset in range(0, len(compacted), batch_size):
+        applied, stale, orphan = apply_batch(target, compacted.iloc[offset:offset + batch_size], columns)
+        totals['applied'] += applied
+        totals['stale'] += stale
+        totals['orphan'] += orphan
+    return totals, time.perf_counter() - start
+
+def format_rate(count, seconds):
+    return f"{count / seconds:,.0f}/s" if seconds > 0 else "n/a"
+
+# ==================== MAIN EXECUTION ====================
+
+def main(folder):
+    """Compact the CDC log of a generator run and apply it to silver and fact"""
+    print("="*70)
+    print("🔁 CDC APPLY ENGINE (compact + batch apply)")
+    print("="*70)
+    print(f"\n📂 Folder: {folder}")
+    print(f"Batch size: {BATCH_SIZE:,}")
+
+    start = time.perf_counter()
+    silver = load_silver(folder)
+    fact = build_fact(silver)
+    log = load_change_log(folder)
+    load_seconds = time.perf_counter() - start
+    print(f"\n✅ Loaded {len(silver):,} transactions and {len(log):,} change events ({load_seconds:.2f}s)")
+
+    start = time.perf_counter()
+    compacted = compact_change_log(log)
+    compact_seconds = time.perf_counter() - start
+    print(f"\n=== COMPACTION ===")
+    print(f"Events in: {len(log):,}")
+    print(f"Events out: {len(compacted):,} ({len(log) - len(compacted):,} superseded or duplicate)")
+    print(f"Throughput: {format_rate(len(log), compact_seconds)} ({compact_seconds:.3f}s)")
+
+    for layer, target, columns in (('SILVER', silver, SILVER_UPDATE_COLUMNS),
+                                   ('FACT', fact, FACT_UPDATE_COLUMNS)):
+        totals, seconds = apply_in_batches(target, compacted, columns)
+        if layer == 'FACT':
+            derive_measures(target)
+        print(f"\n=== APPLY TO {layer} ===")
+        print(f"Rows updated: {totals['applied']:,}")
+        print(f"Stale events skipped: {totals['stale']:,}")
+        print(f"Orphan events (unknown transaction_id): {totals['orphan']:,}")
+        print(f"Throughput: {format_rate(len(compacted), seconds)} ({seconds:.3f}s)")
+
+    print(f"\n=== RESULTING STATE ===")
+    print(f"Refunded transactions: {int(fact['is_refunded'].sum()):,}")
+    print(f"Total refund amount: ₹{fact['refund_amount_paise'].sum() / 100:,.2f}")
+    print(f"Retried transactions: {int((fact['attempt_number'] > 1).sum()):,}")
+    print(f"Still Pending: {int((fact['transaction_status'] == 'Pending').sum()):,}")
+    print(f"Total cashback: ₹{fact['cashback_amount_paise'].sum() / 100:,.2f}")
+    print(f"Total gateway revenue: ₹{fact['gateway_revenue_paise'].sum() / 100:,.2f}")
+
+    print("\n" + "="*70)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python CDC_Apply_Engine.py <generator_output_folder>")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1]))
@@ -0,0 +1,335 @@
+import contextlib
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import Incremental_Data_Generator as gen
+from Approx_Sketches import SKETCH_FILE_NAME
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control the dry run
+
+# Total sample rows generated across the three days (split in the same
+# ratio as DAY1_ROWS : DAY2_ROWS : DAY3_ROWS)
+SAMPLE_ROWS = 6000
+
+# Where the real run will write its output folder
+TARGET_DIR = os.getcwd()
+
+# Headroom kept free on disk / in RAM (fraction of what is available)
+SAFETY_MARGIN = 0.10
+
+# Parallel counter engine: worker processes (COUNTER_WORKERS when set above 1)
+# and a slice size small enough that every sample day spans several slices,
+# so the sample actually runs on the process pool
+PARALLEL_SAMPLE_WORKERS = gen.COUNTER_WORKERS if gen.COUNTER_WORKERS > 1 else min(4, max(2, os.cpu_count() or 2))
+PARALLEL_SAMPLE_CHUNK_ROWS = 250
+
+# ==================== ENGINES ====================
+
+# Generation engines the real run can use (name -> description and the
+# generator settings that select it); the full pipeline is sampled once per
+# engine and extrapolated separately
+ENGINES = {
+    'sequential': {
+        'description': "Incremental_Data_Generator.py row loop (list of dicts -> DataFrame)",
+        'settings': {'RNG_MODE': 'sequential'},
+    },
+    'counter': {
+        'description': "Counter-based RNG (vectorized Philox slices), in-process",
+        'settings': {'RNG_MODE': 'counter', 'COUNTER_WORKERS': 1},
+    },
+    'counter_parallel': {
+        'description': f"Counter-based RNG on {PARALLEL_SAMPLE_WORKERS} worker processes "
+                       f"({PARALLEL_SAMPLE_CHUNK_ROWS:,}-row slices in the sample)",
+        'settings': {'RNG_MODE': 'counter', 'COUNTER_WORKERS': PARALLEL_SAMPLE_WORKERS,
+                     'COUNTER_CHUNK_ROWS': PARALLEL_SAMPLE_CHUNK_ROWS},
+    },
+}
+
+def configured_engine():
+    """Engine the real run will use, from RNG_MODE and COUNTER_WORKERS"""
+    if gen.RNG_MODE == 'counter' and gen.COUNTER_WORKERS > 1:
+        return 'counter_parallel'
+    return gen.RNG_MODE
+
+# ==================== SYSTEM PROBES ====================
+
+def get_available_ram():
+    """Return available physical memory in bytes (None if unknown)"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def get_available_disk(path):
+    """Return free disk space in bytes for the volume holding path"""
+    return shutil.disk_usage(path).free
+
+def get_children_peak_rss():
+    """Peak RSS in bytes of the largest finished child process (None if unknown)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # bytes on macOS, KB elsewhere
+
+# ==================== SAMPLE RUN ====================
+
+def split_sample_rows(sample_rows):
+    """Split the sample across days in the configured DAY*_ROWS ratio"""
+    total = gen.DAY1_ROWS + gen.DAY2_ROWS + gen.DAY3_ROWS
+    day1 = max(1, round(sample_rows * gen.DAY1_ROWS / total))
+    day2 = max(1, round(sample_rows * gen.DAY2_ROWS / total))
+    day3 = max(1, sample_rows - day1 - day2)
+    return day1, day2, day3
+
+def parquet_sizes(output_dir):
+    """{CSV name: bytes of the same rows as Parquet}, or None without a Parquet engine (pyarrow)"""
+    import pandas as pd
+    sizes = {}
+    parquet_path = os.path.join(output_dir, "_size_probe.parquet")
+    try:
+        for name in sorted(os.listdir(output_dir)):
+            if not name.endswith(".csv"):
+                continue
+            pd.read_csv(os.path.join(output_dir, name)).to_parquet(parquet_path, index=False)
+            sizes[name] = os.path.getsize(parquet_path)
+    except ImportError:
+        return None
+    finally:
+        if os.path.exists(parquet_path):
+            os.remove(parquet_path)
+    return sizes
+
+def run_generator(tmp_dir, measure_parquet=False):
+    """Run Incremental_Data_Generator.main() in tmp_dir
+
+    Returns (seconds, {file name: bytes}, {CSV name: Parquet bytes} or None).
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            gen.main()
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+    [folder] = os.listdir(tmp_dir)
+    output_dir = os.path.join(tmp_dir, folder)
+    file_bytes = {name: os.path.getsize(os.path.join(output_dir, name)) for name in sorted(os.listdir(output_dir))}
+    parquet_bytes = parquet_sizes(output_dir) if measure_parquet else None
+    shutil.rmtree(output_dir)
+    return seconds, file_bytes, parquet_bytes
+
+def run_sample(sample_rows, engine):
+    """Run the whole generator (days, CDC, master data, sketches, report) on a sample, measuring cost"""
+    sample_days = split_sample_rows(sample_rows)
+    settings = dict(ENGINES[engine]['settings'], DAY1_ROWS=sample_days[0], DAY2_ROWS=sample_days[1],
+                    DAY3_ROWS=sample_days[2])
+    saved = {name: getattr(gen, name) for name in settings}
+    for name, value in settings.items():
+        setattr(gen, name, value)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Timing pass (tracemalloc would slow the row loop down)
+            seconds, file_bytes, parquet_bytes = run_generator(tmp_dir, measure_parquet=True)
+
+            # Memory pass: tracemalloc sees the Python heap of this process only,
+            # so worker processes are measured by their peak RSS instead
+            tracemalloc.start()
+            try:
+                run_generator(tmp_dir)
+                _, peak_memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            worker_rss = get_children_peak_rss() if gen.COUNTER_WORKERS > 1 else None
+    finally:
+        for name, value in saved.items():
+            setattr(gen, name, value)
+
+    return {
+        'rows': sample_days,
+        'seconds': seconds,
+        'peak_memory': peak_memory,
+        'worker_rss': worker_rss,
+        'workers': settings.get('COUNTER_WORKERS', 1),
+        'file_bytes': file_bytes,
+        'parquet_bytes': parquet_bytes,
+    }
+
+# ==================== EXTRAPOLATION ====================
+
+# Files that are not counted in the folder's size suffix
+UNSIZED_FILES = {SKETCH_FILE_NAME, "validation_report.txt"}
+
+def file_scale(file_name, sample_days, full_days):
+    """How much a sample output file grows at the configured row counts (1.0 = fixed size)"""
+    match = re.match(r"day(\d+)_(transactions|transaction_updates)\.csv$", file_name)
+    if not match:
+        # Master data (NUM_CUSTOMERS / NUM_MERCHANTS, Day 3 renames only touch the
+        # MERCHANT_NAMES merchants), sketches and the report do not grow with the rows
+        return 1.0
+    day, kind = int(match.group(1)), match.group(2)
+    if kind == 'transactions':
+        return full_days[day - 1] / sample_days[day - 1]
+    # A day's CDC events are for the rows of the days before it
+    return sum(full_days[:day - 1]) / sum(sample_days[:day - 1])
+
+def extrapolate(sample):
+    """Scale sample measurements to the configured row counts"""
+    full_days = (gen.DAY1_ROWS, gen.DAY2_ROWS, gen.DAY3_ROWS)
+    scale = sum(full_days) / sum(sample['rows'])
+    file_bytes = {name: size * file_scale(name, sample['rows'], full_days)
+                  for name, size in sample['file_bytes'].items()}
+    parquet_bytes = None
+    if sample['parquet_bytes'] is not None:
+        parquet_bytes = {name: size * file_scale(name, sample['rows'], full_days)
+                         for name, size in sample['parquet_bytes'].items()}
+
+    # Estimate: the parent's Python heap (tracemalloc) scaled linearly in rows -
+    # fixed costs (master data, sketch setup) make it high, native buffers
+    # outside the heap make it low - plus each worker's measured RSS, unscaled
+    peak_memory = sample['peak_memory'] * scale
+    if sample['worker_rss'] is not None:
+        peak_memory += sample['workers'] * sample['worker_rss']
+
+    return {
+        'rows': full_days,
+        'file_bytes': file_bytes,
+        'parquet_bytes': parquet_bytes,
+        'folder_bytes': sum(size for name, size in file_bytes.items() if name not in UNSIZED_FILES),
+        'total_bytes': sum(file_bytes.values()),
+        'heap_memory': sample['peak_memory'] * scale,
+        'worker_rss': sample['worker_rss'],
+        'workers': sample['workers'],
+        'peak_memory': peak_memory,
+        'seconds': sample['seconds'] * scale,
+    }
+
+def format_duration(seconds):
+    """Convert seconds to a human-readable duration"""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}min"
+    return f"{seconds / 3600:.1f}h"
+
+def predict_folder_suffix(plan):
+    """Predict the row/size suffix validate_and_save_data() will give the folder"""
+    row_summary = "+".join(f"{rows // 1000}K" for rows in plan['rows'])
+    size_str = gen.format_file_size(plan['folder_bytes'])
+    return f"{row_summary}_{size_str.replace('.', '_')}"
+
+# ==================== MAIN EXECUTION ====================
+
+def main():
+    """Dry run: predict output size, memory and time without a full generation"""
+    print("="*70)
+    print("🧮 PAYMENT GATEWAY DATA GENERATOR - CAPACITY PLANNER (DRY RUN)")
+    print("="*70)
+    print(f"\nConfiguration (from Incremental_Data_Generator.py):")
+    print(f"  - Day 1 Rows: {gen.DAY1_ROWS:,}")
+    print(f"  - Day 2 Rows: {gen.DAY2_ROWS:,}")
+    print(f"  - Day 3 Rows: {gen.DAY3_ROWS:,}")
+    print(f"  - Customers: {gen.NUM_CUSTOMERS}")
+    print(f"  - Merchants: {gen.NUM_MERCHANTS}")
+
+    plans = {}
+    for engine_name in ENGINES:
+        print(f"\n🔄 Running the generator on a {SAMPLE_ROWS:,}-row sample with {engine_name}...")
+        sample = run_sample(SAMPLE_ROWS, engine_name)
+        plans[engine_name] = extrapolate(sample)
+        sample_rate = sum(sample['rows']) / sample['seconds']
+        print(f"✅ Sample complete ({sample_rate:,.0f} rows/s)")
+
+    # Every engine writes the same files, so sizes come from the configured one
+    engine = configured_engine()
+    plan = plans[engine]
+
+    print("\n" + "="*70)
+    print("📦 PROJECTED OUTPUT SIZE (CSV | Parquet)")
+    print("="*70)
+    for file_name, size in plan['file_bytes'].items():
+        line = f"{file_name}: {gen.format_file_size(size)}"
+        if plan['parquet_bytes'] is not None and file_name in plan['parquet_bytes']:
+            line += f" | Parquet {gen.format_file_size(plan['parquet_bytes'][file_name])}"
+        print(line)
+    print(f"\nTotal: {gen.format_file_size(plan['total_bytes'])} "
+          f"({gen.format_file_size(plan['folder_bytes'])} of CSVs counted in the folder name)")
+    if plan['parquet_bytes'] is not None:
+        print(f"Total as Parquet: {gen.format_file_size(sum(plan['parquet_bytes'].values()))} "
+              f"(CSV files only, same rows)")
+    else:
+        print("Parquet estimate unavailable: no Parquet engine installed (pip install pyarrow)")
+    print(f"Expected folder suffix: ..._{predict_folder_suffix(plan)}")
+
+    print("\n" + "="*70)
+    print("⏱️  PROJECTED TIME & MEMORY (per engine, estimates)")
+    print("="*70)
+    for engine_name, engine_plan in plans.items():
+        configured = " (configured)" if engine_name == engine else ""
+        print(f"{engine_name}{configured}: {ENGINES[engine_name]['description']}")
+        print(f"  - Wall time: {format_duration(engine_plan['seconds'])}")
+        print(f"  - Peak memory (estimate): {gen.format_file_size(engine_plan['peak_memory'])}")
+        print(f"      Python heap of the main process (tracemalloc, scaled): "
+              f"{gen.format_file_size(engine_plan['heap_memory'])}")
+        if engine_plan['workers'] > 1:
+            if engine_plan['worker_rss'] is not None:
+                print(f"      + {engine_plan['workers']} workers x {gen.format_file_size(engine_plan['worker_rss'])} "
+                      f"peak RSS (measured on the sample, not scaled)")
+            else:
+                print("      + worker processes (RSS not measurable on this platform)")
+    peak_memory = plan['peak_memory']
+
+    print("\n" + "="*70)
+    print("🔍 RESOURCE CHECK")
+    print("="*70)
+    ok = True
+    free_disk = get_available_disk(TARGET_DIR)
+    print(f"Free disk at {TARGET_DIR}: {gen.format_file_size(free_disk)}")
+    if plan['total_bytes'] > free_disk * (1 - SAFETY_MARGIN):
+        print(f"❌ Projected output ({gen.format_file_size(plan['total_bytes'])}) exceeds free disk space!")
+        ok = False
+
+    free_ram = get_available_ram()
+    if free_ram is None:
+        print("⚠️  Could not determine available RAM, skipping memory check")
+    else:
+        print(f"Available RAM: {gen.format_file_size(free_ram)} (checked against the {engine} estimate)")
+        if peak_memory > free_ram * (1 - SAFETY_MARGIN):
+            print(f"❌ Projected peak memory ({gen.format_file_size(peak_memory)}) exceeds available RAM!")
+            ok = False
+            leaner = [name for name, engine_plan in plans.items()
+                      if engine_plan['peak_memory'] <= free_ram * (1 - SAFETY_MARGIN)]
+            if leaner:
+                print(f"   The {leaner[0]} engine would fit ({ENGINES[leaner[0]]['settings']})")
+        elif peak_memory > free_ram * 0.5:
+            print(f"⚠️  Projected peak memory uses more than half of available RAM")
+
+    print("\n" + "="*70)
+    if ok:
+        print("✅ Run fits on this machine. Safe to run Incremental_Data_Generator.py")
+    else:
+        print("🛑 Run does NOT fit on this machine. Reduce DAY*_ROWS (or switch engine) before running.")
+    print("="*70)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
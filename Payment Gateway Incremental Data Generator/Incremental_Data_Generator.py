@@ -3,6 +3,7 @@ import random
 import os
 from datetime import datetime, timedelta
 import numpy as np
+from Approx_Sketches import build_sketch_set, format_sketch_summary, save_sketches, SKETCH_FILE_NAME
 
 # ==================== CONFIGURATION SECTION ====================
 # Edit these variables to control data generation
@@ -18,15 +19,46 @@ NULL_UPDATED_AT_PCT = 0.01    # 1% of Day 2 rows
 MERCHANT_UPDATE_PCT = 0.02    # 2% of Day 3 rows
 TIMEZONE_ISSUE_PCT = 0.0133   # 1.33% of Day 3 rows
 
-# Master data counts
+# CDC update stream (changes to earlier days' transactions, emitted on Day 2 and Day 3)
+PENDING_RESOLVE_PCT = 0.80    # 80% of still-Pending transactions resolve the next day
+REFUND_PCT = 0.02             # 2% of earlier Successful transactions get a refund
+FULL_REFUND_PCT = 0.40        # 40% of refunds are full, the rest partial
+RETRY_PCT = 0.30              # 30% of earlier Failed transactions are retried
+RETRY_SUCCESS_PCT = 0.70      # 70% of retries succeed
+DUPLICATE_EVENT_PCT = 0.01    # 1% of events delivered twice (at-least-once delivery)
+
+# Master data counts (array-backed, tens of millions are fine - IDs widen
+# past 4 digits automatically, see id_width())
 NUM_CUSTOMERS = 1000
 NUM_MERCHANTS = 500
 
+# Money is handled as int64 paise (1 rupee = 100 paise) end to end, so sums
+# are exact; CSVs carry *_paise integer columns
+PAISE_PER_RUPEE = 100
+
+# Files from before the switch to paise carried float rupee columns (amount,
+# fee_amount, cashback_amount, refund_amount). True also writes those, derived
+# from the paise columns, for consumers not yet migrated (see README.md)
+LEGACY_RUPEE_COLUMNS = False
+
 # Date configuration
 DAY1_DATE = "2024-11-01"
 DAY2_DATE = "2024-11-02"
 DAY3_DATE = "2024-11-03"
 
+# Random number generation mode:
+#   'sequential' - one global random / np.random stream seeded with RNG_SEED
+#                  (row N depends on every draw before it)
+#   'counter'    - Philox keyed by (RNG_SEED, day, field), indexed by row, so
+#                  any row range of any day can be regenerated on its own
+RNG_MODE = 'sequential'
+RNG_SEED = 42
+
+# Counter mode: rows generated per vectorized slice, and worker processes
+# generating slices in parallel (1 = in-process)
+COUNTER_CHUNK_ROWS = 1_000_000
+COUNTER_WORKERS = 1
+
 # ==================== MASTER DATA LISTS ====================
 
 # Product Categories
@@ -136,6 +168,20 @@ LOCATION_TYPES = {
     'Rural': 0.10
 }
 
+# Day 3 merchant renames (merchants not listed get " Ltd" appended)
+MERCHANT_NAME_UPDATES = {
+    "Amazon India": "Amazon India Pvt Ltd",
+    "Flipkart": "Flipkart Internet Pvt Ltd",
+    "Swiggy": "Swiggy Ltd",
+    "Zomato": "Zomato Media Pvt Ltd",
+    "MakeMyTrip": "MakeMyTrip India Pvt Ltd",
+    "Paytm Mall": "Paytm E-Commerce Pvt Ltd",
+    "BookMyShow": "BookMyShow Entertainment Pvt Ltd",
+    "Reliance Digital": "Reliance Retail Digital",
+    "Ola": "Ola Fleet Technologies",
+    "PhonePe Store": "PhonePe Internet Pvt Ltd"
+}
+
 # ==================== HELPER FUNCTIONS ====================
 
 def generate_transaction_id(date_str, sequence):
@@ -143,13 +189,17 @@ def generate_transaction_id(date_str, sequence):
     clean_date = date_str.replace("-", "")
     return f"TXN_{clean_date}_{sequence:06d}"
 
+def id_width(count):
+    """Digits in a zero-padded ID: 4, or more once count exceeds 9,999"""
+    return max(4, len(str(count)))
+
 def generate_customer_id(num):
-    """Generate customer ID: USER_0001"""
-    return f"USER_{num:04d}"
+    """Generate customer ID: USER_0001 (USER_00000001 for 10M+ customers)"""
+    return f"USER_{num:0{id_width(NUM_CUSTOMERS)}d}"
 
 def generate_merchant_id(num):
-    """Generate merchant ID: MERCH_0001"""
-    return f"MERCH_{num:04d}"
+    """Generate merchant ID: MERCH_0001 (MERCH_00000001 for 10M+ merchants)"""
+    return f"MERCH_{num:0{id_width(NUM_MERCHANTS)}d}"
 
 def get_random_timestamp(date_str, start_hour=0, end_hour=23):
     """Generate random timestamp within a date range"""
@@ -166,24 +216,20 @@ def get_merchant_name(merchant_id_num):
     else:
         return f"Merchant_{merchant_id_num:04d}"
 
-def get_product_name(category):
-    """Get random product name for a category"""
-    return random.choice(PRODUCTS_BY_CATEGORY[category])
+def calculate_fee(amount_paise):
+    """Calculate gateway fee in paise (1.5% to 3% of amount)"""
+    return int(round(amount_paise * random.uniform(0.015, 0.03)))
 
-def calculate_fee(amount):
-    """Calculate gateway fee (1.5% to 3% of amount)"""
-    return round(amount * random.uniform(0.015, 0.03), 2)
-
-def calculate_cashback(amount, status):
-    """Calculate cashback (0-5% for successful transactions only)"""
+def calculate_cashback(amount_paise, status):
+    """Calculate cashback in paise (0-5% for successful transactions only)"""
     if status == 'Successful':
-        return round(amount * random.uniform(0, 0.05), 2)
-    return 0.0
+        return int(round(amount_paise * random.uniform(0, 0.05)))
+    return 0
 
-def calculate_loyalty_points(amount, status):
-    """Calculate loyalty points (0 to amount/10 for successful transactions)"""
+def calculate_loyalty_points(amount_paise, status):
+    """Calculate loyalty points (0 to rupee amount/10 for successful transactions)"""
     if status == 'Successful':
-        return int(amount / random.uniform(10, 20))
+        return int(amount_paise / PAISE_PER_RUPEE / random.uniform(10, 20))
     return 0
 
 def weighted_random_choice(choices_dict):
@@ -193,11 +239,141 @@ def weighted_random_choice(choices_dict):
     return random.choices(items, weights=weights, k=1)[0]
 
 def generate_amount():
-    """Generate transaction amount using log-normal distribution (₹100 to ₹50,000)"""
+    """Generate transaction amount in paise using log-normal distribution (₹100 to ₹50,000)"""
     # Log-normal distribution centered around ₹2000-3000
     amount = np.random.lognormal(mean=7.5, sigma=1.0)
     amount = max(100, min(50000, amount))  # Clamp between 100 and 50000
-    return round(amount, 2)
+    return int(round(amount * PAISE_PER_RUPEE))
+
+# ==================== BATCH (VECTORIZED) HELPERS ====================
+# NumPy counterparts of the per-row ID helpers above, used by the day loops
+# and counter mode: one call per batch instead of one per row, same output.
+
+def zero_pad(nums, width):
+    """Zero-pad an integer array to strings of at least width digits"""
+    nums = np.asarray(nums)
+    if len(nums) == 0:
+        return np.array([], dtype=str)
+    return np.char.zfill(nums.astype(str), width)
+
+def generate_transaction_ids(date_str, sequences):
+    """Batch generate_transaction_id(): array of TXN_20241101_000001 strings"""
+    clean_date = date_str.replace("-", "")
+    return np.char.add(f"TXN_{clean_date}_", zero_pad(sequences, 6))
+
+# ==================== ARRAY-BACKED MASTER DATA STORE ====================
+# Customers, merchants and products as NumPy arrays, so lookups are one
+# fancy-index per batch and NUM_CUSTOMERS / NUM_MERCHANTS can reach tens of
+# millions. ID and name pools are byte strings (1 byte per character) built
+# digit-column by digit-column, without Python-level formatting per key.
+
+def build_id_pool(prefix, first, count, width):
+    """Byte-string pool prefix + zero-padded (first .. first + count - 1)"""
+    nums = np.arange(first, first + count, dtype=np.int64)
+    prefix_bytes = np.frombuffer(prefix.encode('ascii'), dtype=np.uint8)
+    chars = np.empty((count, len(prefix_bytes) + width), dtype=np.uint8)
+    chars[:, :len(prefix_bytes)] = prefix_bytes
+    for digit in range(width):
+        place = 10 ** (width - 1 - digit)
+        chars[:, len(prefix_bytes) + digit] = (nums // place) % 10 + ord('0')
+    return chars.view(f'S{chars.shape[1]}').reshape(count)
+
+def build_name_pool(prefix, count, min_width=4):
+    """Byte-string pool prefix + (0 .. count - 1) padded like f"{i:04d}" (wider numbers keep all digits)"""
+    parts = []
+    start, width = 0, min_width
+    while start < count:
+        stop = min(count, 10 ** width)
+        parts.append(build_id_pool(prefix, start, stop - start, width))
+        start, width = stop, width + 1
+    return np.concatenate(parts) if parts else np.array([], dtype=f'S{len(prefix) + min_width}')
+
+class DecodedPool:
+    """Read-only view of a byte-string pool that decodes only the entries looked up
+
+    The sequential row loop indexes it like a list of str, without turning
+    the whole pool into Python strings (tens of millions of keys would cost
+    gigabytes, once per day). Decoded entries are cached, so the cache holds
+    at most one string per row drawn.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self._pool)
+
+    def __getitem__(self, index):
+        value = self._decoded.get(index)
+        if value is None:
+            value = self._decoded[index] = self._pool[index].decode('utf-8')
+        return value
+
+class MasterDataStore:
+    """ID/name pools and product offset tables for the configured master data
+
+    All lookups take 0-based index arrays: customer index i is USER_{i + 1},
+    merchant index i is MERCH_{i + 1} (named MERCHANT_NAMES[i] when it exists,
+    Merchant_{i:04d} otherwise, as get_merchant_name() returns).
+    """
+
+    def __init__(self, num_customers, num_merchants):
+        self.num_customers = num_customers
+        self.num_merchants = num_merchants
+        self.customer_ids = build_id_pool("USER_", 1, num_customers, id_width(num_customers))
+        self.merchant_ids = build_id_pool("MERCH_", 1, num_merchants, id_width(num_merchants))
+
+        known_names = np.array([name.encode('utf-8') for name in MERCHANT_NAMES[:num_merchants]])
+        fallback_names = build_name_pool("Merchant_", num_merchants)
+        self.merchant_names = fallback_names.astype(np.result_type(fallback_names, known_names))
+        self.merchant_names[:len(known_names)] = known_names
+
+        # Products: one flat array, sliced per category by offset / count
+        self.product_categories = np.array(PRODUCT_CATEGORIES)
+        self.product_counts = np.array([len(PRODUCTS_BY_CATEGORY[c]) for c in PRODUCT_CATEGORIES])
+        self.product_offsets = np.concatenate([[0], np.cumsum(self.product_counts)[:-1]])
+        self.products = np.array([p for c in PRODUCT_CATEGORIES for p in PRODUCTS_BY_CATEGORY[c]])
+
+    @property
+    def shape(self):
+        return self.num_customers, self.num_merchants
+
+    def customer_ids_at(self, indexes):
+        return self.customer_ids[indexes].astype(str)
+
+    def merchant_ids_at(self, indexes):
+        return self.merchant_ids[indexes].astype(str)
+
+    def merchant_names_at(self, indexes):
+        return np.char.decode(self.merchant_names[indexes], 'utf-8')
+
+    def row_pools(self):
+        """Pools for the sequential row loop (decoded per row lookup, not per pool)
+
+        Returns customer IDs, merchant IDs and merchant names as DecodedPool
+        views indexed like the arrays, plus (category, products) pairs in
+        PRODUCT_CATEGORIES order so random.choice() draws exactly what it drew
+        from the category list.
+        """
+        return (DecodedPool(self.customer_ids),
+                DecodedPool(self.merchant_ids),
+                DecodedPool(self.merchant_names),
+                [(category, PRODUCTS_BY_CATEGORY[category]) for category in PRODUCT_CATEGORIES])
+
+    def products_at(self, category_indexes, product_positions):
+        """(category, product) arrays for category indexes and positions within them"""
+        return (self.product_categories[category_indexes],
+                self.products[self.product_offsets[category_indexes] + product_positions])
+
+_master_data = None
+
+def get_master_data():
+    """Shared MasterDataStore for the current NUM_CUSTOMERS / NUM_MERCHANTS"""
+    global _master_data
+    if _master_data is None or _master_data.shape != (NUM_CUSTOMERS, NUM_MERCHANTS):
+        _master_data = MasterDataStore(NUM_CUSTOMERS, NUM_MERCHANTS)
+    return _master_data
 
 # ==================== DAY 1 DATA GENERATION ====================
 
@@ -205,28 +381,30 @@ def generate_day1_data():
     """Generate Day 1 clean baseline data"""
     print(f"\n🔄 Generating Day 1 data ({DAY1_ROWS:,} rows)...")
     
+    customer_ids, merchant_ids, merchant_names, category_products = get_master_data().row_pools()
+    transaction_ids = generate_transaction_ids(DAY1_DATE, np.arange(1, DAY1_ROWS + 1)).tolist()
     data = []
     transaction_counter = 1
     
     for i in range(DAY1_ROWS):
         # Basic IDs
-        transaction_id = generate_transaction_id(DAY1_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, NUM_MERCHANTS)
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         # Transaction details
         transaction_timestamp = get_random_timestamp(DAY1_DATE)
-        merchant_name = get_merchant_name(merchant_id_num - 1)
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        merchant_name = merchant_names[merchant_id_num - 1]
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
         # Financial details
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         # Other details
         payment_method = weighted_random_choice(PAYMENT_METHODS)
@@ -245,9 +423,9 @@ def generate_day1_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -282,26 +460,28 @@ def generate_day2_data():
     print(f"   ⚠️  Late-arriving rows: {late_arriving_count:,}")
     print(f"   ⚠️  NULL updated_at rows: {null_updated_count:,}")
     
+    customer_ids, merchant_ids, merchant_names, category_products = get_master_data().row_pools()
+    transaction_ids = generate_transaction_ids(DAY2_DATE, np.arange(1, DAY2_ROWS + 1)).tolist()
     data = []
     transaction_counter = 1
     
     # Generate clean rows
     for i in range(clean_count):
-        transaction_id = generate_transaction_id(DAY2_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, NUM_MERCHANTS)
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         transaction_timestamp = get_random_timestamp(DAY2_DATE)
-        merchant_name = get_merchant_name(merchant_id_num - 1)
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        merchant_name = merchant_names[merchant_id_num - 1]
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         payment_method = weighted_random_choice(PAYMENT_METHODS)
         device_type = weighted_random_choice(DEVICE_TYPES)
@@ -318,9 +498,9 @@ def generate_day2_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -335,24 +515,24 @@ def generate_day2_data():
     # Generate late-arriving rows (transaction_timestamp = Day 1, updated_at = Day 2)
     print(f"   🔄 Adding late-arriving rows...")
     for i in range(late_arriving_count):
-        transaction_id = generate_transaction_id(DAY2_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, NUM_MERCHANTS)
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         # Transaction happened on Day 1, but recorded on Day 2
         transaction_timestamp = get_random_timestamp(DAY1_DATE)
         updated_at = get_random_timestamp(DAY2_DATE)
         
-        merchant_name = get_merchant_name(merchant_id_num - 1)
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        merchant_name = merchant_names[merchant_id_num - 1]
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         payment_method = weighted_random_choice(PAYMENT_METHODS)
         device_type = weighted_random_choice(DEVICE_TYPES)
@@ -367,9 +547,9 @@ def generate_day2_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -384,21 +564,21 @@ def generate_day2_data():
     # Generate NULL updated_at rows
     print(f"   🔄 Adding NULL updated_at rows...")
     for i in range(null_updated_count):
-        transaction_id = generate_transaction_id(DAY2_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, NUM_MERCHANTS)
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         transaction_timestamp = get_random_timestamp(DAY2_DATE)
-        merchant_name = get_merchant_name(merchant_id_num - 1)
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        merchant_name = merchant_names[merchant_id_num - 1]
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         payment_method = weighted_random_choice(PAYMENT_METHODS)
         device_type = weighted_random_choice(DEVICE_TYPES)
@@ -413,9 +593,9 @@ def generate_day2_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -446,26 +626,28 @@ def generate_day3_data():
     print(f"   ⚠️  Merchant update rows: {merchant_update_count:,}")
     print(f"   ⚠️  Timezone issue rows: {timezone_issue_count:,}")
     
+    customer_ids, merchant_ids, merchant_names, category_products = get_master_data().row_pools()
+    transaction_ids = generate_transaction_ids(DAY3_DATE, np.arange(1, DAY3_ROWS + 1)).tolist()
     data = []
     transaction_counter = 1
     
     # Generate clean rows
     for i in range(clean_count):
-        transaction_id = generate_transaction_id(DAY3_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, NUM_MERCHANTS)
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         transaction_timestamp = get_random_timestamp(DAY3_DATE)
-        merchant_name = get_merchant_name(merchant_id_num - 1)
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        merchant_name = merchant_names[merchant_id_num - 1]
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         payment_method = weighted_random_choice(PAYMENT_METHODS)
         device_type = weighted_random_choice(DEVICE_TYPES)
@@ -482,9 +664,9 @@ def generate_day3_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -498,39 +680,26 @@ def generate_day3_data():
     
     # Generate merchant update rows (same merchant_id, updated merchant_name)
     print(f"   🔄 Adding merchant update rows...")
-    merchant_name_updates = {
-        "Amazon India": "Amazon India Pvt Ltd",
-        "Flipkart": "Flipkart Internet Pvt Ltd",
-        "Swiggy": "Swiggy Ltd",
-        "Zomato": "Zomato Media Pvt Ltd",
-        "MakeMyTrip": "MakeMyTrip India Pvt Ltd",
-        "Paytm Mall": "Paytm E-Commerce Pvt Ltd",
-        "BookMyShow": "BookMyShow Entertainment Pvt Ltd",
-        "Reliance Digital": "Reliance Retail Digital",
-        "Ola": "Ola Fleet Technologies",
-        "PhonePe Store": "PhonePe Internet Pvt Ltd"
-    }
-    
     for i in range(merchant_update_count):
-        transaction_id = generate_transaction_id(DAY3_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, min(NUM_MERCHANTS, len(MERCHANT_NAMES)))
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         transaction_timestamp = get_random_timestamp(DAY3_DATE)
         
         # Get original merchant name and update it
-        original_name = get_merchant_name(merchant_id_num - 1)
-        merchant_name = merchant_name_updates.get(original_name, f"{original_name} Ltd")
+        original_name = merchant_names[merchant_id_num - 1]
+        merchant_name = MERCHANT_NAME_UPDATES.get(original_name, f"{original_name} Ltd")
         
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         payment_method = weighted_random_choice(PAYMENT_METHODS)
         device_type = weighted_random_choice(DEVICE_TYPES)
@@ -547,9 +716,9 @@ def generate_day3_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -564,10 +733,10 @@ def generate_day3_data():
     # Generate timezone issue rows (transaction_timestamp in EST, updated_at in IST)
     print(f"   🔄 Adding timezone issue rows...")
     for i in range(timezone_issue_count):
-        transaction_id = generate_transaction_id(DAY3_DATE, transaction_counter)
-        customer_id = generate_customer_id(random.randint(1, NUM_CUSTOMERS))
+        transaction_id = transaction_ids[transaction_counter - 1]
+        customer_id = customer_ids[random.randint(1, NUM_CUSTOMERS) - 1]
         merchant_id_num = random.randint(1, NUM_MERCHANTS)
-        merchant_id = generate_merchant_id(merchant_id_num)
+        merchant_id = merchant_ids[merchant_id_num - 1]
         
         # Transaction timestamp in EST (subtract 10.5 hours from IST to get EST equivalent)
         transaction_timestamp_ist = get_random_timestamp(DAY3_DATE)
@@ -576,15 +745,15 @@ def generate_day3_data():
         # updated_at in IST
         updated_at = get_random_timestamp(DAY3_DATE)
         
-        merchant_name = get_merchant_name(merchant_id_num - 1)
-        product_category = random.choice(PRODUCT_CATEGORIES)
-        product_name = get_product_name(product_category)
+        merchant_name = merchant_names[merchant_id_num - 1]
+        product_category, products = random.choice(category_products)
+        product_name = random.choice(products)
         
-        amount = generate_amount()
-        fee_amount = calculate_fee(amount)
+        amount_paise = generate_amount()
+        fee_amount_paise = calculate_fee(amount_paise)
         transaction_status = weighted_random_choice(TRANSACTION_STATUSES)
-        cashback_amount = calculate_cashback(amount, transaction_status)
-        loyalty_points = calculate_loyalty_points(amount, transaction_status)
+        cashback_amount_paise = calculate_cashback(amount_paise, transaction_status)
+        loyalty_points = calculate_loyalty_points(amount_paise, transaction_status)
         
         payment_method = weighted_random_choice(PAYMENT_METHODS)
         device_type = weighted_random_choice(DEVICE_TYPES)
@@ -599,9 +768,9 @@ def generate_day3_data():
             'merchant_name': merchant_name,
             'product_category': product_category,
             'product_name': product_name,
-            'amount': amount,
-            'fee_amount': fee_amount,
-            'cashback_amount': cashback_amount,
+            'amount_paise': amount_paise,
+            'fee_amount_paise': fee_amount_paise,
+            'cashback_amount_paise': cashback_amount_paise,
             'loyalty_points': loyalty_points,
             'payment_method': payment_method,
             'transaction_status': transaction_status,
@@ -617,8 +786,432 @@ def generate_day3_data():
     print(f"✅ Day 3 complete: {len(df):,} rows")
     return df
 
+# ==================== COUNTER-BASED (RANDOM-ACCESS) GENERATION ====================
+# Every random field of a row is a pure function of (RNG_SEED, day, field, row
+# index): each (day, field) pair gets its own Philox key and row i reads the
+# i-th counter position of that stream. A slice [start, stop) therefore costs
+# O(stop - start) to regenerate, slices can be generated in any order or in
+# parallel, and a day's rows do not change when other days' sizes do.
+#
+# Issue rows (late-arriving, NULL updated_at, merchant update, timezone) are
+# picked per row from the 'issue' stream, so their counts are ~PCT * rows
+# rather than exact, and they are interleaved instead of appended at the end.
+
+# Stream id of every random field (part of the Philox key - never renumber)
+COUNTER_FIELDS = {
+    'issue': 0,
+    'customer': 1,
+    'merchant': 2,
+    'timestamp': 3,
+    'updated_at': 4,
+    'category': 5,
+    'product': 6,
+    'amount': 7,
+    'fee': 8,
+    'status': 9,
+    'cashback': 10,
+    'loyalty': 11,
+    'payment_method': 12,
+    'device': 13,
+    'location': 14,
+    'cdc_day2': 15,
+    'cdc_day3': 16,
+}
+
+DAY_DATES = {1: DAY1_DATE, 2: DAY2_DATE, 3: DAY3_DATE}
+
+def counter_uniforms(day, field, start, stop, draws_per_row=1):
+    """Uniform [0, 1) draws for rows [start, stop) of one day's field stream
+
+    Returns shape (rows,) or (rows, draws_per_row). Philox produces 4 uint64
+    per counter step, so the stream is advanced to the slice start without
+    generating anything before it.
+    """
+    key = np.array([RNG_SEED, (day << 16) | COUNTER_FIELDS[field]], dtype=np.uint64)
+    bit_generator = np.random.Philox(key=key)
+    first = start * draws_per_row
+    bit_generator.advance(first // 4)
+    skip = first % 4
+    raw = bit_generator.random_raw(skip + (stop - start) * draws_per_row)[skip:]
+    # Top 53 bits -> double in [0, 1)
+    uniforms = (raw >> np.uint64(11)) * (1.0 / (1 << 53))
+    if draws_per_row > 1:
+        return uniforms.reshape(stop - start, draws_per_row)
+    return uniforms
+
+def uniform_ints(uniforms, low, high):
+    """Map uniforms to integers in [low, high] (inclusive, like random.randint)"""
+    return low + (uniforms * (high - low + 1)).astype(np.int64)
+
+def weighted_choices_from_uniforms(choices_dict, uniforms):
+    """Inverse-CDF weighted choice: one item per uniform"""
+    items = np.array(list(choices_dict.keys()), dtype=object)
+    weights = np.array(list(choices_dict.values()), dtype=np.float64)
+    cumulative = np.cumsum(weights / weights.sum())
+    index = np.minimum(np.searchsorted(cumulative, uniforms, side='right'), len(items) - 1)
+    return items[index]
+
+def timestamps_from_uniforms(date_str, uniforms):
+    """Uniform second of the day (same distribution as get_random_timestamp())"""
+    return np.datetime64(date_str, 's') + uniform_ints(uniforms, 0, 86399).astype('timedelta64[s]')
+
+def format_timestamps(timestamps):
+    """datetime64[s] array -> 'YYYY-MM-DD HH:MM:SS' strings"""
+    if len(timestamps) == 0:
+        return np.array([], dtype=object)
+    return np.char.replace(np.datetime_as_string(timestamps, unit='s'), 'T', ' ').astype(object)
+
+def products_from_uniforms(category_uniforms, product_uniforms):
+    """Pick a category, then a product within it, via the store's offset tables"""
+    store = get_master_data()
+    category_index = uniform_ints(category_uniforms, 0, len(store.product_categories) - 1)
+    product_index = (product_uniforms * store.product_counts[category_index]).astype(np.int64)
+    return store.products_at(category_index, product_index)
+
+def amounts_from_uniforms(uniforms):
+    """Log-normal amounts in paise (Box-Muller on two uniforms per row), ₹100-₹50,000"""
+    z = np.sqrt(-2.0 * np.log1p(-uniforms[:, 0])) * np.cos(2.0 * np.pi * uniforms[:, 1])
+    amounts = np.clip(np.exp(7.5 + 1.0 * z), 100, 50000)
+    return np.rint(amounts * PAISE_PER_RUPEE).astype(np.int64)
+
+def fees_from_uniforms(amounts_paise, uniforms):
+    """Gateway fee in paise, 1.5% to 3% of each amount (same distribution as calculate_fee())"""
+    return np.rint(amounts_paise * (0.015 + 0.015 * uniforms)).astype(np.int64)
+
+def cashbacks_from_uniforms(amounts_paise, successful, uniforms):
+    """Cashback in paise, 0-5% for successful rows only (as calculate_cashback())"""
+    return np.where(successful, np.rint(amounts_paise * 0.05 * uniforms), 0).astype(np.int64)
+
+def loyalty_points_from_uniforms(amounts_paise, successful, uniforms):
+    """Loyalty points, rupee amount/10-20 for successful rows only (as calculate_loyalty_points())"""
+    return np.where(successful, (amounts_paise / PAISE_PER_RUPEE / (10 + 10 * uniforms)).astype(np.int64), 0)
+
+def generate_day_slice(day, start, stop):
+    """Generate rows [start, stop) of a day (1-3) in counter mode
+
+    Row i always gets transaction sequence i + 1 and the same content,
+    whatever the slice boundaries.
+    """
+    date_str = DAY_DATES[day]
+    n = stop - start
+    u = lambda field, draws=1: counter_uniforms(day, field, start, stop, draws)
+
+    issue_u = u('issue')
+    if day == 2:
+        late = issue_u < LATE_ARRIVING_PCT
+        null_updated = ~late & (issue_u < LATE_ARRIVING_PCT + NULL_UPDATED_AT_PCT)
+    else:
+        late = null_updated = np.zeros(n, dtype=bool)
+    if day == 3:
+        merchant_update = issue_u < MERCHANT_UPDATE_PCT
+        timezone_issue = ~merchant_update & (issue_u < MERCHANT_UPDATE_PCT + TIMEZONE_ISSUE_PCT)
+    else:
+        merchant_update = timezone_issue = np.zeros(n, dtype=bool)
+
+    # IDs and merchant (renamed merchants come from the named-merchant range)
+    merchant_u = u('merchant')
+    merchant_id_nums = np.where(merchant_update,
+                                uniform_ints(merchant_u, 1, min(NUM_MERCHANTS, len(MERCHANT_NAMES))),
+                                uniform_ints(merchant_u, 1, NUM_MERCHANTS))
+    store = get_master_data()
+    merchant_names = store.merchant_names_at(merchant_id_nums - 1).astype(object)
+    if merchant_update.any():
+        merchant_names[merchant_update] = [MERCHANT_NAME_UPDATES.get(name, f"{name} Ltd")
+                                           for name in merchant_names[merchant_update]]
+
+    # Timestamps: late rows happened on Day 1, timezone rows are shifted to EST
+    timestamp_u = u('timestamp')
+    transaction_ts = timestamps_from_uniforms(date_str, timestamp_u)
+    if late.any():
+        transaction_ts[late] = timestamps_from_uniforms(DAY1_DATE, timestamp_u[late])
+    transaction_ts[timezone_issue] -= np.timedelta64(10 * 3600 + 30 * 60, 's')
+    updated_ts = np.where(late | timezone_issue,
+                          timestamps_from_uniforms(date_str, u('updated_at')),
+                          transaction_ts)
+    updated_at = format_timestamps(updated_ts)
+    updated_at[null_updated] = None
+
+    product_category, product_name = products_from_uniforms(u('category'), u('product'))
+
+    # Financials (same formulas as the scalar helpers, fed by counter uniforms)
+    amount_paise = amounts_from_uniforms(u('amount', 2))
+    fee_amount_paise = fees_from_uniforms(amount_paise, u('fee'))
+    transaction_status = weighted_choices_from_uniforms(TRANSACTION_STATUSES, u('status'))
+    successful = transaction_status == 'Successful'
+    cashback_amount_paise = cashbacks_from_uniforms(amount_paise, successful, u('cashback'))
+    loyalty_points = loyalty_points_from_uniforms(amount_paise, successful, u('loyalty'))
+
+    return pd.DataFrame({
+        'transaction_id': generate_transaction_ids(date_str, np.arange(start + 1, stop + 1)),
+        'customer_id': store.customer_ids_at(uniform_ints(u('customer'), 0, NUM_CUSTOMERS - 1)),
+        'transaction_timestamp': format_timestamps(transaction_ts),
+        'merchant_id': store.merchant_ids_at(merchant_id_nums - 1),
+        'merchant_name': merchant_names,
+        'product_category': product_category,
+        'product_name': product_name,
+        'amount_paise': amount_paise,
+        'fee_amount_paise': fee_amount_paise,
+        'cashback_amount_paise': cashback_amount_paise,
+        'loyalty_points': loyalty_points,
+        'payment_method': weighted_choices_from_uniforms(PAYMENT_METHODS, u('payment_method')),
+        'transaction_status': transaction_status,
+        'device_type': weighted_choices_from_uniforms(DEVICE_TYPES, u('device')),
+        'location_type': weighted_choices_from_uniforms(LOCATION_TYPES, u('location')),
+        'currency': "INR",
+        'updated_at': updated_at,
+    })
+
+def _generate_day_slice_args(args):
+    return generate_day_slice(*args)
+
+def generate_day_counter(day, rows, workers=None, chunk_rows=None):
+    """Generate a whole day in counter mode, COUNTER_CHUNK_ROWS slices at a time on COUNTER_WORKERS processes"""
+    workers = COUNTER_WORKERS if workers is None else workers
+    chunk_rows = COUNTER_CHUNK_ROWS if chunk_rows is None else chunk_rows
+    print(f"\n🔄 Generating Day {day} data ({rows:,} rows, counter RNG)...")
+    slices = [(day, start, min(start + chunk_rows, rows)) for start in range(0, rows, chunk_rows)]
+    if workers > 1 and len(slices) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_generate_day_slice_args, slices))
+    else:
+        parts = [generate_day_slice(*args) for args in slices]
+    df = pd.concat(parts, ignore_index=True) if parts else generate_day_slice(day, 0, 0)
+    print(f"✅ Day {day} complete: {len(df):,} rows")
+    return df
+
+# ==================== MASTER DATA FILES (CUSTOMERS & MERCHANTS) ====================
+# Versioned master data the generator owns, so dimensions load from small
+# files instead of scanning the transaction history. One row per version:
+# version 1 starts on DAY1_DATE; a change opens a new version on its day and
+# closes the previous one (effective_to = day of the change, exclusive).
+
+def build_customer_master():
+    """All NUM_CUSTOMERS customers, one version each (customers never change)"""
+    return pd.DataFrame({
+        'customer_id': get_master_data().customer_ids.astype(str),
+        'version': 1,
+        'effective_from': DAY1_DATE,
+        'effective_to': None,
+        'is_current': True,
+    })
+
+def build_merchant_master(df_day3):
+    """All NUM_MERCHANTS merchants plus a dated version for each Day 3 rename"""
+    store = get_master_data()
+    merchants = pd.DataFrame({
+        'merchant_id': store.merchant_ids.astype(str),
+        'merchant_name': np.char.decode(store.merchant_names, 'utf-8'),
+        'version': 1,
+        'effective_from': DAY1_DATE,
+        'effective_to': None,
+        'is_current': True,
+    })
+
+    # Renames are whatever names Day 3 actually carried for a merchant
+    renames = df_day3[['merchant_id', 'merchant_name']].drop_duplicates()
+    renames = renames.merge(merchants[['merchant_id', 'merchant_name']], on='merchant_id',
+                            how='inner', suffixes=('', '_original'))
+    renames = renames[renames['merchant_name'] != renames['merchant_name_original']]
+    renames = renames.drop_duplicates(subset='merchant_id')
+
+    renamed = merchants['merchant_id'].isin(renames['merchant_id'])
+    merchants.loc[renamed, 'effective_to'] = DAY3_DATE
+    merchants.loc[renamed, 'is_current'] = False
+    new_versions = pd.DataFrame({
+        'merchant_id': renames['merchant_id'].to_numpy(),
+        'merchant_name': renames['merchant_name'].to_numpy(),
+        'version': 2,
+        'effective_from': DAY3_DATE,
+        'effective_to': None,
+        'is_current': True,
+    })
+    return (pd.concat([merchants, new_versions], ignore_index=True)
+            .sort_values(['merchant_id', 'version'], ignore_index=True))
+
+def build_master_data(df_day3):
+    """Return {'customers': df, 'merchants': df} versioned master data"""
+    return {
+        'customers': build_customer_master(),
+        'merchants': build_merchant_master(df_day3),
+    }
+
+def master_data_as_of(master, date_str):
+    """Master data as it stood at the end of date_str (later changes not yet known)"""
+    known = master[master['effective_from'] <= date_str].copy()
+    closed_later = known['effective_to'].fillna('') > date_str
+    known.loc[closed_later, 'effective_to'] = None
+    known.loc[closed_later, 'is_current'] = True
+    return known
+
+def master_data_delta(master, date_str):
+    """Versions that took effect on date_str, as of that day (the day's incremental master file)"""
+    as_of = master_data_as_of(master, date_str)
+    return as_of[as_of['effective_from'] == date_str]
+
+def master_data_files(name, master):
+    """{file name: rows} for one master: the full file plus each non-empty daily delta"""
+    files = {f"{name}.csv": master}
+    for day, date_str in DAY_DATES.items():
+        delta = master_data_delta(master, date_str)
+        if len(delta):
+            files[f"day{day}_{name}_delta.csv"] = delta
+    return files
+
+# ==================== CDC UPDATE STREAM ====================
+# Events for base day d's rows on a later day e are drawn per row, from stream
+# 'cdc_day{e}' of day d (counter mode) or from np.random (sequential mode).
+# In counter mode a row's events depend only on (RNG_SEED, d, e, row index)
+# and its own base-day state, so regenerating a slice of day d with
+# generate_day_slice() and feeding it to cdc_events_for_rows() reproduces
+# exactly the events the full run emitted for those rows.
+
+# One uniform per row per decision (order of the draws in a row - never reorder)
+CDC_DRAWS = ['gate', 'outcome', 'refund_kind', 'refund_fraction', 'updated_at',
+             'cashback', 'loyalty', 'duplicate', 'order', 'duplicate_order']
+
+CDC_COLUMNS = ['transaction_id', 'change_type', 'transaction_status', 'cashback_amount_paise',
+               'loyalty_points', 'is_refunded', 'refund_amount_paise', 'refund_date',
+               'attempt_number', 'updated_at']
+
+def cdc_uniforms(base_day, event_day, start, stop):
+    """(rows, len(CDC_DRAWS)) uniforms for base_day rows [start, stop) on event_day"""
+    if RNG_MODE == 'counter':
+        return counter_uniforms(base_day, f'cdc_day{event_day}', start, stop, len(CDC_DRAWS))
+    return np.random.random((stop - start, len(CDC_DRAWS)))
+
+def cdc_events_for_rows(df, base_day, start=0):
+    """CDC events on every later day for one base day's rows
+
+    df holds rows [start, start + len(df)) of base_day. Every event carries the
+    full after-image of the mutable columns, so the latest event per
+    transaction_id (by updated_at) is its current state. A transaction that
+    turns Successful earns cashback and loyalty points the way a Successful
+    base row does. Returns {event_day: events}; each frame keeps a '_order'
+    column for order_cdc_events().
+    """
+    n = len(df)
+    transaction_ids = df['transaction_id'].to_numpy(dtype=object)
+    amount = df['amount_paise'].to_numpy(dtype=np.int64)
+    status = df['transaction_status'].to_numpy(dtype=object).copy()
+    cashback = df['cashback_amount_paise'].to_numpy(dtype=np.int64).copy()
+    loyalty = df['loyalty_points'].to_numpy(dtype=np.int64).copy()
+    is_refunded = np.zeros(n, dtype=bool)
+    refunded = np.zeros(n, dtype=np.int64)
+    refund_date = np.full(n, None, dtype=object)
+    attempt = np.ones(n, dtype=np.int64)
+
+    retry_statuses = {
+        'Successful': RETRY_SUCCESS_PCT,
+        'Failed': 1 - RETRY_SUCCESS_PCT
+    }
+    resolve_statuses = {
+        'Successful': TRANSACTION_STATUSES['Successful'],
+        'Failed': TRANSACTION_STATUSES['Failed']
+    }
+
+    events_by_day = {}
+    for event_day in range(base_day + 1, 4):
+        draws = cdc_uniforms(base_day, event_day, start, start + n)
+        u = {name: draws[:, i] for i, name in enumerate(CDC_DRAWS)}
+
+        remaining = amount - refunded
+        resolve = (status == 'Pending') & (u['gate'] < PENDING_RESOLVE_PCT)
+        refund = (status == 'Successful') & (remaining > 0) & (u['gate'] < REFUND_PCT)
+        retry = (status == 'Failed') & (u['gate'] < RETRY_PCT)
+        updated_at = format_timestamps(timestamps_from_uniforms(DAY_DATES[event_day], u['updated_at']))
+
+        change_type = np.full(n, None, dtype=object)
+        change_type[resolve] = 'status_change'
+        change_type[retry] = 'retry'
+        previous_status = status.copy()
+        status[resolve] = weighted_choices_from_uniforms(resolve_statuses, u['outcome'][resolve])
+        status[retry] = weighted_choices_from_uniforms(retry_statuses, u['outcome'][retry])
+        attempt[retry] += 1
+
+        # A partial refund is at least 1 paise; one that would take everything left is a full refund
+        partial_amount = np.clip(np.rint(remaining * (0.1 + 0.8 * u['refund_fraction'])).astype(np.int64),
+                                 1, remaining)
+        full = refund & ((u['refund_kind'] < FULL_REFUND_PCT) | (partial_amount >= remaining))
+        partial = refund & ~full
+        change_type[full] = 'full_refund'
+        change_type[partial] = 'partial_refund'
+        refund_amount = np.where(full, remaining, partial_amount)
+        refunded[refund] += refund_amount[refund]
+        is_refunded[refund] = True
+        refund_date[refund] = updated_at[refund]
+
+        # Earned when the transaction turns Successful, as on the day it was generated
+        now_successful = (previous_status != 'Successful') & (status == 'Successful')
+        cashback[now_successful] = cashbacks_from_uniforms(amount[now_successful], True,
+                                                           u['cashback'][now_successful])
+        loyalty[now_successful] = loyalty_points_from_uniforms(amount[now_successful], True,
+                                                               u['loyalty'][now_successful])
+
+        # At-least-once delivery: some events arrive twice, in no particular order
+        changed = np.flatnonzero(resolve | refund | retry)
+        duplicated = changed[u['duplicate'][changed] < DUPLICATE_EVENT_PCT]
+        rows = np.concatenate([changed, duplicated])
+        events = pd.DataFrame({
+            'transaction_id': transaction_ids[rows],
+            'change_type': change_type[rows],
+            'transaction_status': status[rows],
+            'cashback_amount_paise': cashback[rows],
+            'loyalty_points': loyalty[rows],
+            'is_refunded': is_refunded[rows],
+            'refund_amount_paise': pd.array(np.where(is_refunded, refunded, 0)[rows], dtype='Int64'),
+            'refund_date': refund_date[rows],
+            'attempt_number': attempt[rows],
+            'updated_at': updated_at[rows],
+            '_order': np.concatenate([u['order'][changed], u['duplicate_order'][duplicated]]),
+        }, columns=CDC_COLUMNS + ['_order'])
+        # Nullable int so refunds are written as paise integers, not floats
+        events.loc[~events['is_refunded'], 'refund_amount_paise'] = pd.NA
+        events_by_day[event_day] = events
+
+    return events_by_day
+
+def order_cdc_events(frames):
+    """Merge per-base-day event frames into one delivery-ordered change log"""
+    events = pd.concat(frames, ignore_index=True)
+    events = events.sort_values('_order', kind='stable', ignore_index=True)
+    return events.drop(columns='_order')
+
+def generate_cdc_events(df_day1, df_day2, df_day3):
+    """Generate CDC change logs for Day 2 and Day 3 against earlier days' transactions
+
+    Day 1 rows can change on Day 2 and again on Day 3; Day 2 rows on Day 3.
+    """
+    print(f"\n🔄 Generating CDC update stream...")
+
+    events_by_base_day = {
+        1: cdc_events_for_rows(df_day1, 1),
+        2: cdc_events_for_rows(df_day2, 2),
+    }
+
+    cdc_logs = {}
+    for event_day in (2, 3):
+        day_label = f"day{event_day}"
+        frames = [events[event_day] for events in events_by_base_day.values() if event_day in events]
+        df = order_cdc_events(frames)
+        duplicate_count = int(df['transaction_id'].duplicated().sum())
+        cdc_logs[day_label] = df
+        print(f"   {day_label}: {len(df):,} change events ({duplicate_count:,} duplicates)")
+
+    print(f"✅ CDC update stream complete")
+    return cdc_logs
+
 # ==================== VALIDATION & FILE SAVING ====================
 
+def add_legacy_rupee_columns(df):
+    """With LEGACY_RUPEE_COLUMNS, put the old rupee column (e.g. amount) before each *_paise column"""
+    if not LEGACY_RUPEE_COLUMNS:
+        return df
+    df = df.copy()
+    for column in [c for c in df.columns if c.endswith('_paise')]:
+        df.insert(df.columns.get_loc(column), column[:-len('_paise')], df[column] / PAISE_PER_RUPEE)
+    return df
+
 def format_file_size(size_bytes):
     """Convert bytes to human-readable format"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -627,7 +1220,7 @@ def format_file_size(size_bytes):
         size_bytes /= 1024.0
     return f"{size_bytes:.2f}TB"
 
-def validate_and_save_data(df_day1, df_day2, df_day3):
+def validate_and_save_data(df_day1, df_day2, df_day3, cdc_logs=None, master_data=None):
     """Validate data quality and save to CSV files in timestamped folder"""
     print("\n" + "="*70)
     print("📊 DATA VALIDATION & SAVING")
@@ -654,26 +1247,47 @@ def validate_and_save_data(df_day1, df_day2, df_day3):
     # Save Day 1
     print(f"\n💾 Saving Day 1 data...")
     day1_path = os.path.join(output_dir, "day1_transactions.csv")
-    df_day1.to_csv(day1_path, index=False, encoding='utf-8')
+    add_legacy_rupee_columns(df_day1).to_csv(day1_path, index=False, encoding='utf-8')
     day1_size = os.path.getsize(day1_path)
     print(f"   ✅ day1_transactions.csv saved ({format_file_size(day1_size)})")
     
     # Save Day 2
     print(f"\n💾 Saving Day 2 data...")
     day2_path = os.path.join(output_dir, "day2_transactions.csv")
-    df_day2.to_csv(day2_path, index=False, encoding='utf-8')
+    add_legacy_rupee_columns(df_day2).to_csv(day2_path, index=False, encoding='utf-8')
     day2_size = os.path.getsize(day2_path)
     print(f"   ✅ day2_transactions.csv saved ({format_file_size(day2_size)})")
     
     # Save Day 3
     print(f"\n💾 Saving Day 3 data...")
     day3_path = os.path.join(output_dir, "day3_transactions.csv")
-    df_day3.to_csv(day3_path, index=False, encoding='utf-8')
+    add_legacy_rupee_columns(df_day3).to_csv(day3_path, index=False, encoding='utf-8')
     day3_size = os.path.getsize(day3_path)
     print(f"   ✅ day3_transactions.csv saved ({format_file_size(day3_size)})")
     
+    # Save CDC update logs
+    cdc_logs = cdc_logs or {}
+    cdc_sizes = {}
+    for day_label, df_updates in cdc_logs.items():
+        print(f"\n💾 Saving {day_label} CDC update log...")
+        updates_path = os.path.join(output_dir, f"{day_label}_transaction_updates.csv")
+        add_legacy_rupee_columns(df_updates).to_csv(updates_path, index=False, encoding='utf-8')
+        cdc_sizes[day_label] = os.path.getsize(updates_path)
+        print(f"   ✅ {day_label}_transaction_updates.csv saved ({format_file_size(cdc_sizes[day_label])})")
+    
+    # Save versioned master data (full files + per-day deltas)
+    master_data = master_data or {}
+    master_sizes = {}
+    for name, master in master_data.items():
+        print(f"\n💾 Saving {name} master data...")
+        for file_name, df_master in master_data_files(name, master).items():
+            master_path = os.path.join(output_dir, file_name)
+            df_master.to_csv(master_path, index=False, encoding='utf-8')
+            master_sizes[file_name] = os.path.getsize(master_path)
+            print(f"   ✅ {file_name} saved ({len(df_master):,} rows, {format_file_size(master_sizes[file_name])})")
+    
     # Calculate total size and rename folder
-    total_size = day1_size + day2_size + day3_size
+    total_size = day1_size + day2_size + day3_size + sum(cdc_sizes.values()) + sum(master_sizes.values())
     total_size_str = format_file_size(total_size)
     
     # Rename folder with size info
@@ -738,7 +1352,7 @@ def validate_and_save_data(df_day1, df_day2, df_day3):
     print("📈 OVERALL SUMMARY")
     print("="*70)
     print(f"Total Rows Generated: {total_rows:,}")
-    print(f"Total CSV Files: 3")
+    print(f"Total CSV Files: {3 + len(cdc_logs) + len(master_sizes)}")
     print(f"Total Size: {total_size_str}")
     print(f"Output Location: {new_output_dir}")
     print(f"\nAll transaction_ids unique: {df_day1['transaction_id'].nunique() + df_day2['transaction_id'].nunique() + df_day3['transaction_id'].nunique() == total_rows}")
@@ -751,6 +1365,22 @@ def validate_and_save_data(df_day1, df_day2, df_day3):
     else:
         print(f"✅ No duplicate transaction_ids across all days")
     
+    # Approximate statistics (constant-memory, mergeable across days/runs)
+    print("\n" + "="*70)
+    print("📐 APPROXIMATE STATISTICS (HLL + KLL SKETCHES)")
+    print("="*70)
+    day_sketches = {
+        'day1': build_sketch_set(df_day1),
+        'day2': build_sketch_set(df_day2),
+        'day3': build_sketch_set(df_day3)
+    }
+    for day, sketch_set in day_sketches.items():
+        print(f"\n=== {day.upper()} ===")
+        for line in format_sketch_summary(sketch_set):
+            print(line)
+    save_sketches(os.path.join(new_output_dir, SKETCH_FILE_NAME), day_sketches)
+    print(f"\n   ✅ {SKETCH_FILE_NAME} saved (merge/compare runs with Approx_Sketches.py)")
+    
     # Data Quality Issues Summary
     print("\n" + "="*70)
     print("🐛 DATA QUALITY ISSUES INJECTED (For Blog 2)")
@@ -761,6 +1391,29 @@ def validate_and_save_data(df_day1, df_day2, df_day3):
     print(f"4. Timezone Issues (Day 3): {timezone_issues:,} rows")
     print(f"\nTotal Issue Rows: {late_arriving + df_day2['updated_at'].isna().sum() + len(merchant_updates) + timezone_issues:,}")
     
+    # CDC update stream summary
+    if cdc_logs:
+        print("\n" + "="*70)
+        print("🔁 CDC UPDATE STREAM")
+        print("="*70)
+        for day_label, df_updates in cdc_logs.items():
+            print(f"\n=== {day_label.upper()} UPDATES ===")
+            print(f"Total Events: {len(df_updates):,}")
+            print(f"Transactions Touched: {df_updates['transaction_id'].nunique():,}")
+            for change_type, count in df_updates['change_type'].value_counts().sort_index().items():
+                print(f"  - {change_type}: {count:,}")
+    
+    # Master data summary
+    if master_data:
+        print("\n" + "="*70)
+        print("🗂️  MASTER DATA")
+        print("="*70)
+        for name, master in master_data.items():
+            print(f"\n=== {name.upper()} ===")
+            print(f"Versions: {len(master):,} ({int(master['is_current'].sum()):,} current)")
+            for file_name, delta in list(master_data_files(name, master).items())[1:]:
+                print(f"  - {file_name}: {len(delta):,} versions")
+    
     # Save validation report
     print("\n💾 Saving validation report...")
     report_path = os.path.join(new_output_dir, "validation_report.txt")
@@ -802,7 +1455,31 @@ def validate_and_save_data(df_day1, df_day2, df_day3):
         f.write(f"1. Late-Arriving Data: {late_arriving:,} rows\n")
         f.write(f"2. NULL updated_at: {df_day2['updated_at'].isna().sum():,} rows\n")
         f.write(f"3. Merchant Updates: {len(merchant_updates):,} rows\n")
-        f.write(f"4. Timezone Issues: {timezone_issues:,} rows\n")
+        f.write(f"4. Timezone Issues: {timezone_issues:,} rows\n\n")
+        
+        if cdc_logs:
+            f.write("=== CDC UPDATE STREAM ===\n")
+            for day_label, df_updates in cdc_logs.items():
+                f.write(f"{day_label}_transaction_updates.csv: {len(df_updates):,} events "
+                        f"({df_updates['transaction_id'].nunique():,} transactions, "
+                        f"{format_file_size(cdc_sizes[day_label])})\n")
+                for change_type, count in df_updates['change_type'].value_counts().sort_index().items():
+                    f.write(f"  - {change_type}: {count:,}\n")
+            f.write("\n")
+        
+        if master_data:
+            f.write("=== MASTER DATA ===\n")
+            for name, master in master_data.items():
+                f.write(f"{name}.csv: {len(master):,} versions ({int(master['is_current'].sum()):,} current)\n")
+                for file_name, delta in list(master_data_files(name, master).items())[1:]:
+                    f.write(f"  - {file_name}: {len(delta):,} versions\n")
+            f.write("\n")
+        
+        f.write("=== APPROXIMATE STATISTICS (HLL + KLL SKETCHES) ===\n")
+        for day, sketch_set in day_sketches.items():
+            f.write(f"{day.upper()}:\n")
+            for line in format_sketch_summary(sketch_set):
+                f.write(f"  {line}\n")
     
     print(f"   ✅ validation_report.txt saved")
     
@@ -834,20 +1511,34 @@ def main():
     print(f"  - NULL updated_at (Day 2): {NULL_UPDATED_AT_PCT*100:.1f}% = ~{int(DAY2_ROWS * NULL_UPDATED_AT_PCT):,} rows")
     print(f"  - Merchant Updates (Day 3): {MERCHANT_UPDATE_PCT*100:.1f}% = ~{int(DAY3_ROWS * MERCHANT_UPDATE_PCT):,} rows")
     print(f"  - Timezone Issues (Day 3): {TIMEZONE_ISSUE_PCT*100:.2f}% = ~{int(DAY3_ROWS * TIMEZONE_ISSUE_PCT):,} rows")
+    print(f"\nCDC Update Stream (Day 2 & Day 3):")
+    print(f"  - Pending resolved next day: {PENDING_RESOLVE_PCT*100:.0f}%")
+    print(f"  - Refunds: {REFUND_PCT*100:.1f}% of Successful ({FULL_REFUND_PCT*100:.0f}% full)")
+    print(f"  - Retries: {RETRY_PCT*100:.0f}% of Failed ({RETRY_SUCCESS_PCT*100:.0f}% succeed)")
+    print(f"  - Duplicate deliveries: {DUPLICATE_EVENT_PCT*100:.1f}%")
+    
+    print(f"\nRNG: {RNG_MODE} (seed {RNG_SEED})")
     
     # Set random seed for reproducibility
-    random.seed(42)
-    np.random.seed(42)
+    random.seed(RNG_SEED)
+    np.random.seed(RNG_SEED)
     
     start_time = datetime.now()
     
     # Generate data
-    df_day1 = generate_day1_data()
-    df_day2 = generate_day2_data()
-    df_day3 = generate_day3_data()
+    if RNG_MODE == 'counter':
+        df_day1 = generate_day_counter(1, DAY1_ROWS)
+        df_day2 = generate_day_counter(2, DAY2_ROWS)
+        df_day3 = generate_day_counter(3, DAY3_ROWS)
+    else:
+        df_day1 = generate_day1_data()
+        df_day2 = generate_day2_data()
+        df_day3 = generate_day3_data()
+    cdc_logs = generate_cdc_events(df_day1, df_day2, df_day3)
+    master_data = build_master_data(df_day3)
     
     # Validate and save
-    output_dir = validate_and_save_data(df_day1, df_day2, df_day3)
+    output_dir = validate_and_save_data(df_day1, df_day2, df_day3, cdc_logs, master_data)
     
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
@@ -856,8 +1547,13 @@ def main():
     print(f"\n🎯 Next Steps:")
     print(f"   1. Navigate to: {output_dir}")
     print(f"   2. Upload CSV files to BigQuery Bronze layer")
-    print(f"   3. Create tables: raw_transactions_day1, raw_transactions_day2, raw_transactions_day3")
-    print(f"   4. Start building incremental load SQL for Blog 2!")
+    print(f"      (or load them locally: python Bronze_Bulk_Loader.py \"{output_dir}\")")
+    print(f"   3. Load day*_transactions.csv into raw_transactions (all days appended)")
+    print(f"   4. Build silver with sql/02_silver_generator_transactions.sql, then run sql/03 and sql/04")
+    print(f"      (or build dim_customers / dim_merchants from customers.csv / merchants.csv")
+    print(f"       with sql/03_gold_dims_from_master_data.sql)")
+    print(f"   5. Load day*_transaction_updates.csv into raw_transaction_updates and run sql/06_apply_transaction_updates.sql")
+    print(f"   6. Start building incremental load SQL for Blog 2!")
     
     print("\n" + "="*70)
     
@@ -0,0 +1,389 @@
+import glob
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from Bronze_Bulk_Loader import DUCKDB_PATH
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control the profiling run
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sql")
+
+# Scripts profiled when none are given on the command line (in run order):
+# the generator pipeline from bronze, i.e. silver, gold, analytics, then CDC
+DEFAULT_SCRIPTS = ["02_silver_generator_transactions.sql", "03_gold_dim_*.sql", "04_gold_fact_transactions.sql",
+                   "05_analytics_queries.sql", "06_apply_transaction_updates.sql"]
+
+# Run history (one entry per run) and per-run physical plans
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_profile_history.json")
+PLANS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_plans")
+
+# A statement is flagged when it gets this much slower / faster than the previous run
+CHANGE_THRESHOLD = 0.10
+
+# Statements faster than this are too noisy to flag
+MIN_FLAG_SECONDS = 0.01
+
+# ==================== BIGQUERY -> DUCKDB TRANSLATION ====================
+# The SQL files target BigQuery; these rewrites cover what the pipeline uses.
+# Anything else fails on the local engine and is reported as such.
+
+PROJECT_ID = "grand-jigsaw-476820-t1"
+
+# BigQuery functions DuckDB lacks, as per-connection macros
+BIGQUERY_MACROS = [
+    "CREATE OR REPLACE TEMP MACRO safe_divide(a, b) AS CASE WHEN b = 0 THEN NULL ELSE a / b END",
+    "CREATE OR REPLACE TEMP MACRO format_date(fmt, d) AS strftime(CAST(d AS DATE), fmt)",
+]
+
+TRANSLATIONS = [
+    (re.compile(rf"`{re.escape(PROJECT_ID)}\.(\w+)\.(\w+)`"), r"\1.\2"),
+    (re.compile(rf"`{re.escape(PROJECT_ID)}\.(\w+)`"), r"\1"),
+    (re.compile(r"^\s*MERGE\s+(?!INTO\b)", re.I), "MERGE INTO "),
+    (re.compile(r"APPROX_QUANTILES\(([^,()]+(?:\([^()]*\))?),\s*(\d+)\)\[OFFSET\((\d+)\)\]", re.I),
+     r"approx_quantile(\1, CAST(\3 / \2 AS FLOAT))"),
+    (re.compile(r"\*\s*EXCEPT\s*\(", re.I), "* EXCLUDE("),
+    (re.compile(r"\bCURRENT_TIMESTAMP\(\)", re.I), "current_timestamp"),
+    (re.compile(r"\bINT64\b"), "BIGINT"),
+    (re.compile(r"\bFLOAT64\b"), "DOUBLE"),
+    (re.compile(r"\bNUMERIC\b"), "DECIMAL(38, 9)"),
+    (re.compile(r"EXTRACT\(DAYOFWEEK FROM ([^)]+)\)", re.I), r"(EXTRACT(DOW FROM \1) + 1)"),
+    (re.compile(r"\bTIMESTAMP\(([\w.]+)\)"), r"CAST(\1 AS TIMESTAMP)"),
+    (re.compile(r"\bDATE\(([\w.]+)\)"), r"CAST(\1 AS DATE)"),
+    (re.compile(r"UNNEST\(GENERATE_DATE_ARRAY\(('[^']+'),\s*('[^']+'),\s*INTERVAL 1 DAY\)\)\s+AS\s+(\w+)", re.I),
+     r"(SELECT CAST(generate_series AS DATE) AS \3 FROM generate_series(DATE \1, DATE \2, INTERVAL 1 DAY))"),
+]
+
+def translate(statement):
+    """Rewrite one BigQuery statement into DuckDB SQL"""
+    for pattern, replacement in TRANSLATIONS:
+        statement = pattern.sub(replacement, statement)
+    return statement
+
+# ==================== SCRIPT PARSING ====================
+
+def split_statements(sql):
+    """Split a script into (label, statement) pairs, labelled by QUERY N headers
+
+    Comments are dropped; quoted strings and backticked names are kept intact.
+    """
+    statements = []
+    current = []
+    header = None
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = len(sql) if end == -1 else end
+            match = re.match(r"--\s*(QUERY \d+:.*)", sql[i:end])
+            if match:
+                header = match.group(1).strip()
+            i = end
+            continue
+        if char in ("'", '"', "`"):
+            end = sql.find(char, i + 1)
+            end = len(sql) - 1 if end == -1 else end
+            current.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        if char == ";":
+            statements.append((header, "".join(current).strip()))
+            current = []
+            header = None
+        else:
+            current.append(char)
+        i += 1
+    statements.append((header, "".join(current).strip()))
+
+    labelled = []
+    for header, statement in statements:
+        if not statement:
+            continue
+        summary = " ".join(statement.split())
+        label = header or (summary[:70] + ("..." if len(summary) > 70 else ""))
+        labelled.append((f"#{len(labelled) + 1} {label}", statement))
+    return labelled
+
+def resolve_scripts(patterns):
+    """Expand script names / globs relative to SQL_DIR (or as given)"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) or sorted(glob.glob(os.path.join(SQL_DIR, pattern)))
+        if not matches:
+            raise FileNotFoundError(f"No SQL script matches {pattern}")
+        paths.extend(matches)
+    return paths
+
+# ==================== PROFILING ====================
+
+def connect(database_path, profile_path):
+    """Fresh connection (cold buffer cache) with JSON profiling and BigQuery macros"""
+    import duckdb
+    connection = duckdb.connect(database_path)
+    connection.execute("PRAGMA enable_profiling = 'json'")
+    connection.execute("SET profiling_mode = 'detailed'")
+    connection.execute(f"SET profiling_output = '{profile_path}'")
+    for macro in BIGQUERY_MACROS:
+        connection.execute(macro)
+    return connection
+
+def prepare_schemas(database_path):
+    """Create the silver / gold schemas the scripts write to"""
+    import duckdb
+    connection = duckdb.connect(database_path)
+    try:
+        for schema in ("payment_gateway_silver", "payment_gateway_gold"):
+            connection.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+    finally:
+        connection.close()
+
+# Sink operators report a single count row; their input is the real output
+SINK_OPERATORS = {'CREATE_TABLE_AS', 'INSERT', 'UPDATE', 'DELETE', 'MERGE_INTO', 'BATCH_CREATE_TABLE_AS'}
+
+def output_rows(plan):
+    """Rows produced by the statement (result rows, or rows written by a sink)"""
+    node = plan
+    while node.get('operator_type') in (None, 'EXPLAIN_ANALYZE') and node.get('children'):
+        node = node['children'][0]
+    if node.get('operator_type') in SINK_OPERATORS and node.get('children'):
+        node = node['children'][0]
+    return node.get('operator_cardinality')
+
+# Operators that read stored data; their result_set_size is what they read
+SCAN_OPERATORS = {'TABLE_SCAN'}
+
+def scanned_bytes(node):
+    """Bytes the plan's table scans produced (decompressed values of the columns read)
+
+    DuckDB's query-level total_bytes_read only counts blocks fetched from
+    disk, so it reads 0 for data already in the buffer pool.
+    """
+    total = node.get('result_set_size', 0) if node.get('operator_type') in SCAN_OPERATORS else 0
+    return total + sum(scanned_bytes(child) for child in node.get('children', []))
+
+def format_plan(node, depth=0):
+    """Indented physical plan with actual rows and operator time"""
+    lines = []
+    if node.get('operator_type') not in (None, 'EXPLAIN_ANALYZE'):
+        detail = f"{node['operator_name']}: {node.get('operator_cardinality', 0):,} rows"
+        if node.get('operator_rows_scanned'):
+            detail += f", {node['operator_rows_scanned']:,} scanned"
+        detail += f", {node.get('operator_timing', 0) * 1000:.2f}ms"
+        table = node.get('extra_info', {}).get('Table')
+        if table:
+            detail += f" [{table}]"
+        lines.append("  " * depth + detail)
+        depth += 1
+    for child in node.get('children', []):
+        lines.extend(format_plan(child, depth))
+    return lines
+
+def profile_statement(database_path, statement):
+    """Run one statement under EXPLAIN ANALYZE, returns its metrics and plan"""
+    profile_path = os.path.join(tempfile.gettempdir(), f"query_profile_{os.getpid()}.json")
+    connection = connect(database_path, profile_path)
+    try:
+        start = time.perf_counter()
+        result = connection.execute(f"EXPLAIN ANALYZE {statement}")
+        wall_seconds = time.perf_counter() - start
+        plan = json.loads(result.fetchall()[0][1])
+        rows_out = output_rows(plan)
+        if rows_out is None:
+            # Answered from table statistics (e.g. bare COUNT(*)): no operators ran
+            rows_out = len(connection.execute(statement).fetchall())
+    finally:
+        connection.close()
+    return {
+        'status': 'ok',
+        'wall_seconds': wall_seconds,
+        'engine_seconds': plan.get('latency'),
+        'rows_in': plan.get('cumulative_rows_scanned'),
+        'rows_out': rows_out,
+        'bytes_scanned': scanned_bytes(plan),
+        'peak_memory': plan.get('system_peak_buffer_memory'),
+        'plan': format_plan(plan),
+    }
+
+def profile_scripts(paths, database_path=DUCKDB_PATH):
+    """Profile every statement of every script, in order"""
+    results = []
+    for path in paths:
+        script = os.path.basename(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            statements = split_statements(f.read())
+        for label, statement in statements:
+            try:
+                result = profile_statement(database_path, translate(statement))
+            except Exception as e:
+                result = {'status': 'failed', 'error': str(e).splitlines()[0], 'plan': []}
+            result.update({'script': script, 'label': label})
+            results.append(result)
+    return results
+
+# ==================== HISTORY & COMPARISON ====================
+
+def load_history(path=HISTORY_PATH):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_run(history, run, path=HISTORY_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(history + [run], f, indent=2)
+
+def save_plans(run, results):
+    """Write every statement's physical plan to query_plans/<run_id>.txt"""
+    os.makedirs(PLANS_DIR, exist_ok=True)
+    path = os.path.join(PLANS_DIR, f"{run['run_id']}.txt")
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(f"=== {result['script']} {result['label']} ===\n")
+            if result['status'] != 'ok':
+                f.write(f"FAILED: {result['error']}\n\n")
+                continue
+            f.write("\n".join(result['plan']) + "\n\n")
+    return path
+
+def summarize_scripts(statements):
+    """Per-script totals over successful statements"""
+    totals = {}
+    for s in statements:
+        script = totals.setdefault(s['script'], {'statements': 0, 'failed': 0, 'wall_seconds': 0.0,
+                                                 'rows_in': 0, 'bytes_scanned': 0, 'peak_memory': 0})
+        script['statements'] += 1
+        if s['status'] != 'ok':
+            script['failed'] += 1
+            continue
+        script['wall_seconds'] += s['wall_seconds']
+        script['rows_in'] += s['rows_in'] or 0
+        script['bytes_scanned'] += s['bytes_scanned'] or 0
+        script['peak_memory'] = max(script['peak_memory'], s['peak_memory'] or 0)
+    return totals
+
+def compare_marker(current, previous):
+    """Change vs the previous run: '+12% 🔴', '-30% 🟢' or '' when not comparable"""
+    if not previous or previous.get('status') != 'ok' or current['status'] != 'ok' or not previous['wall_seconds']:
+        return ""
+    change = current['wall_seconds'] / previous['wall_seconds'] - 1
+    marker = ""
+    if max(current['wall_seconds'], previous['wall_seconds']) >= MIN_FLAG_SECONDS:
+        if change > CHANGE_THRESHOLD:
+            marker = " 🔴"
+        elif change < -CHANGE_THRESHOLD:
+            marker = " 🟢"
+    return f"{change * 100:+.0f}%{marker}"
+
+def format_bytes(size_bytes):
+    """Convert bytes to human-readable format"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f}{unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f}TB"
+
+# ==================== MAIN EXECUTION ====================
+
+def main(argv):
+    """Profile the pipeline / analytics SQL on the local DuckDB warehouse"""
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        print("❌ duckdb is not installed (pip install duckdb)")
+        return 1
+
+    run_label = None
+    if argv[:1] == ['--label']:
+        run_label, argv = argv[1], argv[2:]
+
+    print("="*70)
+    print("🔬 QUERY PROFILER (DuckDB stand-in)")
+    print("="*70)
+    print(f"Database: {DUCKDB_PATH}")
+    try:
+        paths = resolve_scripts(argv or DEFAULT_SCRIPTS)
+    except FileNotFoundError as e:
+        print(f"❌ {e} (looked in the current directory and {os.path.normpath(SQL_DIR)})")
+        return 1
+    print(f"Scripts: {', '.join(os.path.basename(p) for p in paths)}")
+
+    if not os.path.exists(DUCKDB_PATH):
+        print(f"❌ {DUCKDB_PATH} not found - load a generator run first (python Bronze_Bulk_Loader.py <folder>)")
+        return 1
+    prepare_schemas(DUCKDB_PATH)
+
+    history = load_history()
+    previous_run = history[-1] if history else None
+    previous = {(s['script'], s['label']): s for s in previous_run['statements']} if previous_run else {}
+
+    start = time.perf_counter()
+    results = profile_scripts(paths)
+    total_seconds = time.perf_counter() - start
+
+    now = datetime.now()
+    run = {
+        'run_id': now.strftime('%Y%m%d_%H%M%S'),
+        'run_at': now.strftime('%Y-%m-%d %H:%M:%S'),
+        'label': run_label,
+        'statements': [{k: v for k, v in r.items() if k != 'plan'} for r in results],
+    }
+
+    print("\n" + "="*70)
+    print("📊 PER-STATEMENT PROFILE (wall | rows in -> out | scanned | peak mem | vs last run)")
+    print("="*70)
+    current_script = None
+    for result in results:
+        if result['script'] != current_script:
+            current_script = result['script']
+            print(f"\n{current_script}")
+        if result['status'] != 'ok':
+            print(f"  ❌ {result['label']}\n       failed on local engine: {result['error']}")
+            continue
+        change = compare_marker(result, previous.get((result['script'], result['label'])))
+        print(f"  {result['label']}")
+        print(f"       {result['wall_seconds'] * 1000:>9,.1f}ms | {result['rows_in'] or 0:>12,} -> {result['rows_out'] or 0:>10,} | "
+              f"{format_bytes(result['bytes_scanned'] or 0):>9} | {format_bytes(result['peak_memory'] or 0):>9} | {change}")
+
+    print("\n" + "="*70)
+    print("📈 PER-SCRIPT TOTALS")
+    print("="*70)
+    previous_totals = summarize_scripts(previous_run['statements']) if previous_run else {}
+    for script, totals in summarize_scripts(results).items():
+        before = previous_totals.get(script)
+        change = ""
+        if before and before['wall_seconds']:
+            change = f" ({(totals['wall_seconds'] / before['wall_seconds'] - 1) * 100:+.0f}% vs last run)"
+        print(f"{script}: {totals['statements']} statements ({totals['failed']} failed), "
+              f"{totals['wall_seconds']:.2f}s{change}, {totals['rows_in']:,} rows scanned, "
+              f"{format_bytes(totals['bytes_scanned'])} scanned, peak {format_bytes(totals['peak_memory'])}")
+
+    ok = [r for r in results if r['status'] == 'ok']
+    if ok:
+        print("\n🐢 Slowest statements:")
+        for result in sorted(ok, key=lambda r: r['wall_seconds'], reverse=True)[:5]:
+            print(f"   {result['wall_seconds'] * 1000:>9,.1f}ms  {result['script']} {result['label']}")
+
+    save_run(history, run)
+    plans_path = save_plans(run, results)
+    print(f"\n💾 Run {run['run_id']}{f' ({run_label})' if run_label else ''} appended to {HISTORY_PATH}")
+    print(f"💾 Physical plans (EXPLAIN ANALYZE) saved to {plans_path}")
+    if previous_run:
+        previous_label = f" ({previous_run['label']})" if previous_run.get('label') else ""
+        print(f"Compared with run {previous_run['run_id']}{previous_label}")
+    print(f"Total profiling time: {total_seconds:.2f}s")
+
+    print("\n" + "="*70)
+    return 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--label'] and len(sys.argv) < 3:
+        print("Usage: python Query_Profiler.py [--label NAME] [script.sql ...]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+
+import Incremental_Data_Generator as gen
+
+# ==================== CONFIGURATION SECTION ====================
+# Edit these variables to control the regeneration
+
+# Rows printed to the console when no output file is given
+PREVIEW_ROWS = 20
+
+# ==================== MAIN EXECUTION ====================
+
+def main(argv):
+    """Regenerate rows [start, stop) of one day, and their CDC events, with the counter-based RNG"""
+    day, start, stop = int(argv[0]), int(argv[1]), int(argv[2])
+    output_path = argv[3] if len(argv) > 3 else None
+    if day not in gen.DAY_DATES or not 0 <= start <= stop:
+        print(f"❌ Invalid slice: day {day}, rows [{start:,}, {stop:,})")
+        return 2
+
+    print("="*70)
+    print("🎯 ROW SLICE REGENERATION (counter RNG)")
+    print("="*70)
+    print(f"Day {day} ({gen.DAY_DATES[day]}), rows [{start:,}, {stop:,}), seed {gen.RNG_SEED}")
+
+    # CDC draws follow RNG_MODE; slices are only reproducible in counter mode
+    gen.RNG_MODE = 'counter'
+    begin = time.perf_counter()
+    df = gen.generate_day_slice(day, start, stop)
+    cdc_events = gen.cdc_events_for_rows(df, day, start)
+    seconds = time.perf_counter() - begin
+    print(f"✅ Generated {len(df):,} rows in {seconds:.2f}s")
+    for event_day, events in cdc_events.items():
+        print(f"🔄 Day {event_day} CDC events for these rows: {len(events):,}")
+
+    if output_path:
+        gen.add_legacy_rupee_columns(df).to_csv(output_path, index=False, encoding='utf-8')
+        print(f"💾 Saved to {output_path}")
+        root, ext = os.path.splitext(output_path)
+        for event_day, events in cdc_events.items():
+            updates_path = f"{root}_day{event_day}_updates{ext or '.csv'}"
+            gen.add_legacy_rupee_columns(gen.order_cdc_events([events])).to_csv(updates_path, index=False, encoding='utf-8')
+            print(f"💾 Saved to {updates_path}")
+    else:
+        print()
+        print(df.head(PREVIEW_ROWS).to_string(index=False))
+        if len(df) > PREVIEW_ROWS:
+            print(f"... {len(df) - PREVIEW_ROWS:,} more rows (pass an output path to save them all)")
+
+    print("\n" + "="*70)
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (4, 5):
+        print("Usage: python Regenerate_Slice.py <day 1-3> <start_row> <stop_row> [output.csv]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1:]))
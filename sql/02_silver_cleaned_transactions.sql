@@ -23,6 +23,11 @@ SELECT
   cashback AS cashback_amount,
   location AS location_type,
   
+  -- Money as int64 paise (1 rupee = 100 paise): exact sums, no float drift
+  CAST(ROUND(product_amount * 100) AS INT64) AS amount_paise,
+  CAST(ROUND(transaction_fee * 100) AS INT64) AS fee_amount_paise,
+  CAST(ROUND(cashback * 100) AS INT64) AS cashback_amount_paise,
+  
   -- Added columns (missing from source)
   'INR' AS currency,
   CURRENT_TIMESTAMP() AS loaded_at,
@@ -0,0 +1,68 @@
+-- ===================================
+-- Silver from the incremental data generator (instead of the Kaggle CSV)
+-- ===================================
+-- Source: day*_transactions.csv from Incremental_Data_Generator.py, all days
+-- appended into payment_gateway_bronze.raw_transactions (Bronze_Bulk_Loader.py
+-- does this locally). Produces the same silver columns as
+-- 02_silver_cleaned_transactions.sql, so the 03/04/05 scripts run unchanged,
+-- plus updated_at, which 06_apply_transaction_updates.sql needs to order CDC
+-- events against the row. Data quality issues (late-arriving rows, NULL
+-- updated_at, timezone shifts) are kept as generated - they are the subject of
+-- the incremental load scripts.
+
+-- Step 1: Create Silver Dataset
+CREATE SCHEMA IF NOT EXISTS `grand-jigsaw-476820-t1.payment_gateway_silver`;
+
+-- Step 2: Create cleaned_transactions table
+CREATE OR REPLACE TABLE `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions` AS
+SELECT
+  -- Generator columns already use the silver names
+  transaction_id,
+  product_category,
+  product_name,
+  loyalty_points,
+  payment_method,
+  transaction_status,
+  merchant_id,
+  device_type,
+  customer_id,
+  CAST(transaction_timestamp AS TIMESTAMP) AS transaction_timestamp,
+  merchant_name,
+  location_type,
+
+  -- Money: the generator writes exact int64 paise; rupee columns are derived
+  amount_paise / 100 AS amount,
+  fee_amount_paise / 100 AS fee_amount,
+  cashback_amount_paise / 100 AS cashback_amount,
+  amount_paise,
+  fee_amount_paise,
+  cashback_amount_paise,
+
+  currency,
+  CAST(updated_at AS TIMESTAMP) AS updated_at,  -- Last change applied to the row (NULL for the Day 2 issue rows)
+  CURRENT_TIMESTAMP() AS loaded_at,
+  'incremental_generator' AS source_system
+
+FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_transactions`;
+
+-- Step 3: Validation Queries
+
+-- Verify row count matches Bronze (no data loss)
+SELECT COUNT(*) as silver_row_count
+FROM `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions`;
+-- Expected: DAY1_ROWS + DAY2_ROWS + DAY3_ROWS (45,000 with the default generator config)
+
+-- Transaction ids are unique across days
+SELECT COUNT(*) - COUNT(DISTINCT transaction_id) as duplicate_transaction_ids
+FROM `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions`;
+-- Expected: 0 (a day file loaded twice shows up here)
+
+-- Injected issue rows per day
+SELECT
+  DATE(updated_at) as updated_date,
+  COUNT(*) as total_rows,
+  COUNTIF(updated_at IS NULL) as null_updated_at,
+  COUNTIF(DATE(transaction_timestamp) < DATE(updated_at)) as late_or_shifted
+FROM `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions`
+GROUP BY updated_date
+ORDER BY updated_date;
@@ -1,6 +1,10 @@
 -- Create Gold Dataset (if not exists)
 CREATE SCHEMA IF NOT EXISTS `grand-jigsaw-476820-t1.payment_gateway_gold`;
 
+-- Source: payment_gateway_silver.cleaned_transactions (Kaggle or generator silver,
+-- whichever 02 script built it). To build from the generator's versioned
+-- customers.csv instead, use 03_gold_dims_from_master_data.sql.
+
 -- Create dim_customers table
 CREATE OR REPLACE TABLE `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers` AS
 SELECT
@@ -22,6 +26,7 @@ SELECT
   NULL AS risk_score,
   
   -- SCD Type 2 columns
+  1 AS version,  -- Same schema as the master-data build
   CURRENT_TIMESTAMP() AS effective_start_date,
   NULL AS effective_end_date,
   TRUE AS is_current,
@@ -1,3 +1,7 @@
+-- Source: payment_gateway_silver.cleaned_transactions (Kaggle or generator silver,
+-- whichever 02 script built it). To build from the generator's versioned
+-- merchants.csv instead, use 03_gold_dims_from_master_data.sql.
+
 -- Create dim_merchants table
 CREATE OR REPLACE TABLE `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants` AS
 SELECT
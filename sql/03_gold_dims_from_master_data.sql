@@ -0,0 +1,238 @@
+-- ===================================
+-- Gold customer & merchant dimensions from generator master data
+-- ===================================
+-- Alternative to 03_gold_dim_customers.sql / 03_gold_dim_merchants.sql (which
+-- read silver) for silver built with 02_silver_generator_transactions.sql.
+-- Run it instead of those two; the other 03 scripts and 04 are unchanged.
+-- Sources (files written by Incremental_Data_Generator.py):
+--   customers.csv             -> payment_gateway_bronze.raw_customers (full, one row per version)
+--   dayN_customers_delta.csv  -> payment_gateway_bronze.raw_customers_delta (appended daily)
+--   merchants.csv             -> payment_gateway_bronze.raw_merchants (full, one row per version)
+--   dayN_merchants_delta.csv  -> payment_gateway_bronze.raw_merchants_delta (appended daily)
+-- A delta holds the versions that took effect that day, as they stood that day.
+-- Loading from the small master files avoids a scan over all of silver.
+
+-- Create Gold Dataset (if not exists)
+CREATE SCHEMA IF NOT EXISTS `grand-jigsaw-476820-t1.payment_gateway_gold`;
+
+-- ===================================
+-- dim_customers (SCD Type 2: one row per master version)
+-- ===================================
+
+-- Create dim_customers table (full build from the versioned master file)
+CREATE OR REPLACE TABLE `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers` AS
+SELECT
+  -- Surrogate key (auto-generated)
+  ROW_NUMBER() OVER (ORDER BY customer_id, version) AS customer_key,
+
+  -- Natural key
+  customer_id,
+
+  -- Customer attributes (placeholders for future enrichment)
+  NULL AS customer_name,
+  NULL AS email,
+  NULL AS phone,
+  NULL AS country,
+  NULL AS city,
+  NULL AS customer_segment,
+  NULL AS registration_date,
+  NULL AS is_verified,
+  NULL AS risk_score,
+
+  -- SCD Type 2 columns (from the master file's version history)
+  version,
+  TIMESTAMP(effective_from) AS effective_start_date,
+  TIMESTAMP(effective_to) AS effective_end_date,
+  is_current,
+
+  -- Audit columns
+  CURRENT_TIMESTAMP() AS created_at,
+  CURRENT_TIMESTAMP() AS updated_at
+
+FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_customers`
+ORDER BY customer_key;
+
+-- ===================================
+-- Incremental load (run after appending a dayN_customers_delta.csv)
+-- ===================================
+
+-- Step 1: Close the current version of customers that have a newer version in the delta
+UPDATE `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers` d
+SET
+  effective_end_date = TIMESTAMP(n.effective_from),
+  is_current = FALSE,
+  updated_at = CURRENT_TIMESTAMP()
+FROM (
+  SELECT customer_id, MAX(version) AS version, MAX(effective_from) AS effective_from
+  FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_customers_delta`
+  GROUP BY customer_id
+) n
+WHERE d.customer_id = n.customer_id
+  AND d.is_current = TRUE
+  AND d.version < n.version;
+
+-- Step 2: Insert delta versions not yet in the dimension
+INSERT INTO `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers`
+SELECT
+  (SELECT MAX(customer_key) FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers`)
+    + ROW_NUMBER() OVER (ORDER BY n.customer_id, n.version) AS customer_key,
+  n.customer_id,
+  NULL AS customer_name,
+  NULL AS email,
+  NULL AS phone,
+  NULL AS country,
+  NULL AS city,
+  NULL AS customer_segment,
+  NULL AS registration_date,
+  NULL AS is_verified,
+  NULL AS risk_score,
+  n.version,
+  TIMESTAMP(n.effective_from) AS effective_start_date,
+  TIMESTAMP(n.effective_to) AS effective_end_date,
+  n.is_current,
+  CURRENT_TIMESTAMP() AS created_at,
+  CURRENT_TIMESTAMP() AS updated_at
+FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_customers_delta` n
+LEFT JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers` d
+  ON n.customer_id = d.customer_id
+  AND n.version = d.version
+WHERE d.customer_id IS NULL;
+
+-- Validation Queries (dim_customers)
+
+-- Check row count (unique customers)
+SELECT COUNT(*) as total_customers
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers`
+WHERE is_current = TRUE;
+-- Expected: NUM_CUSTOMERS (1,000 with the default generator config)
+
+-- Verify no duplicate customer_ids (for current records)
+SELECT
+  customer_id,
+  COUNT(*) as count
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers`
+WHERE is_current = TRUE
+GROUP BY customer_id
+HAVING COUNT(*) > 1;
+-- Expected: 0 rows (no duplicates)
+
+-- Check surrogate key range
+SELECT
+  MIN(customer_key) as min_key,
+  MAX(customer_key) as max_key,
+  COUNT(DISTINCT customer_key) as unique_keys
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers`;
+
+-- Every customer in silver exists in the dimension (master data is complete)
+SELECT COUNT(DISTINCT s.customer_id) as missing_customers
+FROM `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions` s
+LEFT JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers` c
+  ON s.customer_id = c.customer_id
+WHERE c.customer_id IS NULL;
+-- Expected: 0
+
+-- Sample data
+SELECT *
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_customers`
+ORDER BY customer_key
+LIMIT 10;
+
+-- ===================================
+-- dim_merchants (SCD Type 1: current name only)
+-- ===================================
+-- The master file keeps every version (Day 3 renames are version 2 rows
+-- effective on Day 3); the dimension keeps only the current one, like the
+-- silver build, and the name history stays queryable in raw_merchants.
+
+-- Create dim_merchants table (full build from the current master versions)
+CREATE OR REPLACE TABLE `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants` AS
+SELECT
+  -- Surrogate key
+  ROW_NUMBER() OVER (ORDER BY merchant_id) AS merchant_key,
+
+  -- Natural key
+  merchant_id,
+
+  -- Merchant attributes
+  merchant_name,  -- Current name from master data (one row per merchant_id)
+  NULL AS business_type,
+  NULL AS industry,
+  NULL AS country,
+  NULL AS website,
+  NULL AS onboarding_date,
+  NULL AS settlement_frequency,
+  FALSE AS is_active,
+
+  -- Audit columns
+  CURRENT_TIMESTAMP() AS created_at,
+  CURRENT_TIMESTAMP() AS updated_at
+
+FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_merchants`
+WHERE is_current = TRUE;  -- ← CRITICAL: Ensures one row per merchant_id
+
+-- ===================================
+-- Incremental load (run after appending a dayN_merchants_delta.csv)
+-- ===================================
+-- Type 1: overwrite the name of known merchants, insert new ones
+MERGE `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants` d
+USING (
+  SELECT
+    n.merchant_id,
+    n.merchant_name,
+    (SELECT MAX(merchant_key) FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants`)
+      + ROW_NUMBER() OVER (ORDER BY n.merchant_id) AS new_merchant_key
+  FROM (
+    SELECT * EXCEPT(rn)
+    FROM (
+      SELECT
+        *,
+        ROW_NUMBER() OVER (PARTITION BY merchant_id ORDER BY version DESC) AS rn
+      FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_merchants_delta`
+    )
+    WHERE rn = 1  -- Latest version per merchant
+  ) n
+) n
+  ON d.merchant_id = n.merchant_id
+WHEN MATCHED AND d.merchant_name != n.merchant_name THEN
+  UPDATE SET
+    merchant_name = n.merchant_name,
+    updated_at = CURRENT_TIMESTAMP()
+WHEN NOT MATCHED THEN
+  INSERT (merchant_key, merchant_id, merchant_name, business_type, industry, country, website,
+          onboarding_date, settlement_frequency, is_active, created_at, updated_at)
+  VALUES (n.new_merchant_key, n.merchant_id, n.merchant_name, NULL, NULL, NULL, NULL,
+          NULL, NULL, FALSE, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP());
+
+-- Validation Queries (dim_merchants)
+
+-- Check row count
+SELECT COUNT(*) as total_merchants
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants`;
+-- Expected: NUM_MERCHANTS (500 with the default generator config)
+
+-- CRITICAL: Verify no duplicate merchant_ids
+SELECT
+  merchant_id,
+  COUNT(*) as count
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants`
+GROUP BY merchant_id
+HAVING COUNT(*) > 1;
+-- Expected: 0 rows (this is what fixes the 29,256 row explosion bug!)
+
+-- Merchant name history (diagnostic, from the small master file)
+SELECT
+  merchant_id,
+  COUNT(*) as versions,
+  STRING_AGG(CONCAT(merchant_name, ' (from ', CAST(effective_from AS STRING), ')'), ' -> ' ORDER BY version) as name_history
+FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_merchants`
+GROUP BY merchant_id
+HAVING COUNT(*) > 1
+ORDER BY merchant_id
+LIMIT 10;
+-- This shows which merchants were renamed on Day 3 (informational only)
+
+-- Sample data
+SELECT *
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants`
+ORDER BY merchant_key
+LIMIT 10;
@@ -25,14 +25,20 @@ SELECT
   s.amount,
   s.fee_amount,
   s.cashback_amount,
+  s.amount_paise,           -- int64 paise: use these for SUM/AVG rollups
+  s.fee_amount_paise,
+  s.cashback_amount_paise,
   s.loyalty_points,
   
   -- ===================================
-  -- Derived Measures
+  -- Derived Measures (exact integer paise arithmetic)
   -- ===================================
-  s.amount - s.cashback_amount AS net_customer_amount,
-  s.amount - s.fee_amount AS merchant_net_amount,
-  s.fee_amount - s.cashback_amount AS gateway_revenue,
+  s.amount_paise - s.cashback_amount_paise AS net_customer_amount_paise,
+  s.amount_paise - s.fee_amount_paise AS merchant_net_amount_paise,
+  s.fee_amount_paise - s.cashback_amount_paise AS gateway_revenue_paise,
+  CAST(s.amount_paise - s.cashback_amount_paise AS NUMERIC) / 100 AS net_customer_amount,
+  CAST(s.amount_paise - s.fee_amount_paise AS NUMERIC) / 100 AS merchant_net_amount,
+  CAST(s.fee_amount_paise - s.cashback_amount_paise AS NUMERIC) / 100 AS gateway_revenue,
   
   -- ===================================
   -- Timestamps
@@ -44,8 +50,8 @@ SELECT
   -- ===================================
   s.currency,
   FALSE AS is_refunded,
-  NULL AS refund_amount,
-  NULL AS refund_date,
+  CAST(NULL AS INT64) AS refund_amount_paise,  -- Typed so 06_apply_transaction_updates.sql can MERGE into it
+  CAST(NULL AS TIMESTAMP) AS refund_date,
   1 AS attempt_number,
   
   -- ===================================
@@ -135,13 +141,20 @@ LIMIT 10;
 
 -- 5. Check derived measures calculated correctly
 SELECT 
-  amount,
-  cashback_amount,
-  net_customer_amount,
-  (amount - cashback_amount) as calculated_net,
+  amount_paise,
+  cashback_amount_paise,
+  net_customer_amount_paise,
+  (amount_paise - cashback_amount_paise) as calculated_net,
   CASE 
-    WHEN net_customer_amount = (amount - cashback_amount) THEN 'OK'
+    WHEN net_customer_amount_paise = (amount_paise - cashback_amount_paise) THEN 'OK'
     ELSE 'ERROR'
   END as validation
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions`
-LIMIT 10;
\ No newline at end of file
+LIMIT 10;
+
+-- 6. Float drift check: exact paise total vs float total
+SELECT 
+  CAST(SUM(amount_paise) AS NUMERIC) / 100 as exact_total,
+  SUM(amount) as float_total,
+  CAST(SUM(amount_paise) AS NUMERIC) / 100 - CAST(SUM(amount) AS NUMERIC) as drift
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions`;
\ No newline at end of file
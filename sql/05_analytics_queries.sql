@@ -1,3 +1,6 @@
+-- Money rollups sum the int64 *_paise columns (exact, no float drift at any
+-- row count) and convert to rupees once per group: CAST(... AS NUMERIC) / 100
+
 -- ===================================
 -- QUERY 1: Monthly Revenue Trends
 -- ===================================
@@ -7,10 +10,10 @@ SELECT
   d.year,
   d.month_name,
   COUNT(*) as transaction_count,
-  ROUND(SUM(f.amount), 2) as total_revenue,
-  ROUND(AVG(f.amount), 2) as avg_transaction_size,
-  ROUND(SUM(f.fee_amount), 2) as total_fees,
-  ROUND(SUM(f.cashback_amount), 2) as total_cashback
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_revenue,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_transaction_size,
+  CAST(SUM(f.fee_amount_paise) AS NUMERIC) / 100 as total_fees,
+  CAST(SUM(f.cashback_amount_paise) AS NUMERIC) / 100 as total_cashback
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_date` d 
   ON f.date_key = d.date_key
@@ -28,9 +31,9 @@ SELECT
   COUNT(*) as total_transactions,
   SUM(CASE WHEN ts.status_name = 'Successful' THEN 1 ELSE 0 END) as successful_count,
   ROUND(SUM(CASE WHEN ts.status_name = 'Successful' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) AS success_rate_pct,
-  ROUND(AVG(f.fee_amount), 2) as avg_fee,
-  ROUND(AVG(f.amount), 2) as avg_transaction_amount,
-  ROUND(SUM(f.amount), 2) as total_volume
+  ROUND(CAST(AVG(f.fee_amount_paise) AS NUMERIC) / 100, 2) as avg_fee,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_transaction_amount,
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_volume
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_payment_methods` p 
   ON f.payment_method_key = p.payment_method_key
@@ -49,10 +52,10 @@ SELECT
   m.merchant_name,
   m.merchant_id,
   COUNT(*) as transaction_count,
-  ROUND(SUM(f.amount), 2) as total_revenue,
-  ROUND(AVG(f.amount), 2) as avg_transaction_size,
-  ROUND(SUM(f.merchant_net_amount), 2) as merchant_net_revenue,
-  ROUND(SUM(f.fee_amount), 2) as total_fees_paid
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_revenue,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_transaction_size,
+  CAST(SUM(f.merchant_net_amount_paise) AS NUMERIC) / 100 as merchant_net_revenue,
+  CAST(SUM(f.fee_amount_paise) AS NUMERIC) / 100 as total_fees_paid
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_merchants` m 
   ON f.merchant_key = m.merchant_key
@@ -69,10 +72,10 @@ LIMIT 10;
 SELECT 
   CASE WHEN d.is_weekend THEN 'Weekend' ELSE 'Weekday' END AS day_type,
   COUNT(*) as transaction_count,
-  ROUND(SUM(f.amount), 2) as total_revenue,
-  ROUND(AVG(f.amount), 2) as avg_transaction_amount,
-  ROUND(SUM(f.fee_amount), 2) as total_fees,
-  ROUND(SUM(f.fee_amount) * 100.0 / SUM(f.amount), 2) as fee_percentage
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_revenue,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_transaction_amount,
+  CAST(SUM(f.fee_amount_paise) AS NUMERIC) / 100 as total_fees,
+  ROUND(SUM(f.fee_amount_paise) * 100.0 / SUM(f.amount_paise), 2) as fee_percentage
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_date` d 
   ON f.date_key = d.date_key
@@ -88,9 +91,9 @@ ORDER BY transaction_count DESC;
 SELECT 
   c.customer_id,
   COUNT(*) as transaction_count,
-  ROUND(SUM(f.amount), 2) as total_spent,
-  ROUND(AVG(f.amount), 2) as avg_transaction_size,
-  ROUND(SUM(f.cashback_amount), 2) as total_cashback_received,
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_spent,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_transaction_size,
+  CAST(SUM(f.cashback_amount_paise) AS NUMERIC) / 100 as total_cashback_received,
   SUM(f.loyalty_points) as total_loyalty_points,
   MAX(f.transaction_timestamp) as last_transaction_date
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
@@ -111,7 +114,7 @@ SELECT
   l.location_type,
   ts.status_name,
   COUNT(*) as transaction_count,
-  ROUND(SUM(f.amount), 2) as total_amount,
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_amount,
   ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (PARTITION BY l.location_type), 2) as pct_within_location
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_location` l 
@@ -130,9 +133,9 @@ ORDER BY l.location_type, transaction_count DESC;
 SELECT 
   f.product_category,
   COUNT(*) as transaction_count,
-  ROUND(SUM(f.amount), 2) as total_revenue,
-  ROUND(AVG(f.amount), 2) as avg_amount,
-  ROUND(SUM(f.cashback_amount), 2) as total_cashback,
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_revenue,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_amount,
+  CAST(SUM(f.cashback_amount_paise) AS NUMERIC) / 100 as total_cashback,
   COUNT(DISTINCT f.customer_key) as unique_customers
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 GROUP BY f.product_category
@@ -149,8 +152,8 @@ SELECT
   f.device_type,
   COUNT(*) as transaction_count,
   ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as percentage,
-  ROUND(SUM(f.amount), 2) as total_revenue,
-  ROUND(AVG(f.amount), 2) as avg_transaction_size,
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_revenue,
+  ROUND(CAST(AVG(f.amount_paise) AS NUMERIC) / 100, 2) as avg_transaction_size,
   ROUND(SUM(CASE WHEN ts.status_name = 'Successful' THEN 1 ELSE 0 END) * 100.0 / COUNT(*), 2) as success_rate_pct
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_transaction_status` ts
@@ -169,7 +172,7 @@ SELECT
   d.day_of_week_number,
   COUNT(*) as transaction_count,
   ROUND(AVG(COUNT(*)) OVER (PARTITION BY d.is_weekend), 2) as avg_for_day_type,
-  ROUND(SUM(f.amount), 2) as total_revenue
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as total_revenue
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_date` d 
   ON f.date_key = d.date_key
@@ -186,7 +189,7 @@ SELECT
   p.payment_method_name,
   l.location_type,
   COUNT(*) as failed_count,
-  ROUND(SUM(f.amount), 2) as lost_revenue,
+  CAST(SUM(f.amount_paise) AS NUMERIC) / 100 as lost_revenue,
   ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER(), 2) as pct_of_failures
 FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
 JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_payment_methods` p 
@@ -201,6 +204,68 @@ ORDER BY failed_count DESC
 LIMIT 20;
 
 
+-- ===================================
+-- QUERY 11: Daily Approximate Profile (Sketches)
+-- ===================================
+-- Business Question: Did the customer/merchant mix or amount distribution drift day over day?
+-- Uses HyperLogLog (APPROX_COUNT_DISTINCT) and quantile sketches (APPROX_QUANTILES):
+-- fixed memory per group and no exact-distinct shuffle, but the query still scans
+-- fact_transactions, so its cost grows with the table. Compare with the per-day
+-- figures in the generator's validation_report.txt / sketches.json. Quantiles
+-- run on the paise columns, like the KLL sketches (shown here in rupees).
+
+SELECT 
+  d.full_date,
+  COUNT(*) as transaction_count,
+  APPROX_COUNT_DISTINCT(f.customer_key) as approx_unique_customers,
+  APPROX_COUNT_DISTINCT(f.merchant_key) as approx_unique_merchants,
+  APPROX_QUANTILES(f.amount_paise / 100, 100)[OFFSET(50)] as amount_p50,
+  APPROX_QUANTILES(f.amount_paise / 100, 100)[OFFSET(90)] as amount_p90,
+  APPROX_QUANTILES(f.amount_paise / 100, 100)[OFFSET(99)] as amount_p99,
+  APPROX_QUANTILES(f.fee_amount_paise / 100, 100)[OFFSET(50)] as fee_p50,
+  APPROX_QUANTILES(f.cashback_amount_paise / 100, 100)[OFFSET(50)] as cashback_p50
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
+JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_date` d 
+  ON f.date_key = d.date_key
+GROUP BY d.full_date
+ORDER BY d.full_date;
+
+-- Mergeable variant (BigQuery only: HLL_COUNT has no DuckDB equivalent, so the
+-- local Query_Profiler.py run reports these three statements as failures)
+
+-- Step 1: Persist one HLL sketch per day. Only days missing from the table are
+-- sketched, but each run still scans the fact columns (the table is not
+-- date-partitioned) - run it once per daily load, not per query.
+CREATE TABLE IF NOT EXISTS `grand-jigsaw-476820-t1.payment_gateway_gold.daily_unique_sketches` (
+  date_key INT64,
+  customer_sketch BYTES,
+  merchant_sketch BYTES,
+  sketched_at TIMESTAMP
+);
+
+INSERT INTO `grand-jigsaw-476820-t1.payment_gateway_gold.daily_unique_sketches`
+SELECT 
+  f.date_key,
+  HLL_COUNT.INIT(f.customer_key) as customer_sketch,
+  HLL_COUNT.INIT(f.merchant_key) as merchant_sketch,
+  CURRENT_TIMESTAMP() as sketched_at
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
+WHERE f.date_key NOT IN (
+  SELECT date_key FROM `grand-jigsaw-476820-t1.payment_gateway_gold.daily_unique_sketches`
+)
+GROUP BY f.date_key;
+-- A stored sketch is not updated: late-arriving rows for an already-sketched day
+-- (Day 2's issue rows are dated Day 1) need that day's row deleted and Step 1 re-run
+
+-- Step 2: Distinct counts for any date range merge the stored sketches
+-- (a few KB per day) without reading fact_transactions
+SELECT 
+  HLL_COUNT.MERGE(customer_sketch) as approx_unique_customers_all_days,
+  HLL_COUNT.MERGE(merchant_sketch) as approx_unique_merchants_all_days
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.daily_unique_sketches`;
+-- Add WHERE date_key BETWEEN 20241101 AND 20241103 for a date range
+
+
 -- ===================================
 -- END OF ANALYTICS QUERIES
 -- ===================================
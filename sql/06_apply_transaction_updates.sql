@@ -0,0 +1,104 @@
+-- ===================================
+-- Apply CDC Updates (status transitions, refunds, retries)
+-- ===================================
+-- Source: dayN_transaction_updates.csv files from the incremental data generator,
+-- uploaded (appended) into payment_gateway_bronze.raw_transaction_updates.
+-- Target: silver and fact built from the generator's day files
+-- (02_silver_generator_transactions.sql, then 03 and 04). The events key on
+-- the generator's TXN_YYYYMMDD_NNNNNN ids; the Kaggle silver has none of them.
+-- Each event is a full after-image of the mutable columns, so the latest event
+-- per transaction_id (by updated_at) is the transaction's current state.
+-- Same rules as CDC_Apply_Engine.py: last-writer-wins within the log and
+-- against the target row, so an older event never overwrites a newer state.
+-- Re-run after rebuilding the fact with 04 (it resets refunds and retries).
+
+-- Step 1: Compact the change log (last-writer-wins per transaction_id)
+CREATE OR REPLACE TABLE `grand-jigsaw-476820-t1.payment_gateway_silver.compacted_transaction_updates` AS
+SELECT * EXCEPT(rn)
+FROM (
+  SELECT
+    *,
+    ROW_NUMBER() OVER (
+      PARTITION BY transaction_id
+      ORDER BY updated_at DESC
+    ) AS rn  -- Duplicate deliveries share updated_at; any one of them wins
+  FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_transaction_updates`
+)
+WHERE rn = 1;
+
+-- Step 2: Apply to Silver (only events newer than the row; refunds/retries live in the fact table)
+MERGE `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions` s
+USING `grand-jigsaw-476820-t1.payment_gateway_silver.compacted_transaction_updates` u
+  ON s.transaction_id = u.transaction_id
+WHEN MATCHED AND (s.updated_at IS NULL OR u.updated_at > s.updated_at) THEN
+  UPDATE SET
+    transaction_status = u.transaction_status,
+    cashback_amount_paise = u.cashback_amount_paise,  -- Earned when a Pending/Failed transaction turns Successful
+    cashback_amount = u.cashback_amount_paise / 100,
+    loyalty_points = u.loyalty_points,
+    updated_at = u.updated_at;
+
+-- Step 3: Apply to Fact (the events silver holds now, i.e. the ones Step 2 accepted;
+-- idempotent on re-run)
+MERGE `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
+USING (
+  SELECT
+    u.*,
+    ts.status_key
+  FROM `grand-jigsaw-476820-t1.payment_gateway_silver.compacted_transaction_updates` u
+  JOIN `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions` s
+    ON u.transaction_id = s.transaction_id
+    AND u.updated_at = s.updated_at
+  LEFT JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.dim_transaction_status` ts
+    ON u.transaction_status = ts.status_name
+) u
+  ON f.transaction_id = u.transaction_id
+WHEN MATCHED THEN
+  UPDATE SET
+    status_key = u.status_key,
+    cashback_amount_paise = u.cashback_amount_paise,
+    cashback_amount = u.cashback_amount_paise / 100,
+    loyalty_points = u.loyalty_points,
+    net_customer_amount_paise = f.amount_paise - u.cashback_amount_paise,
+    gateway_revenue_paise = f.fee_amount_paise - u.cashback_amount_paise,
+    net_customer_amount = CAST(f.amount_paise - u.cashback_amount_paise AS NUMERIC) / 100,
+    gateway_revenue = CAST(f.fee_amount_paise - u.cashback_amount_paise AS NUMERIC) / 100,
+    is_refunded = u.is_refunded,
+    refund_amount_paise = u.refund_amount_paise,
+    refund_date = u.refund_date,
+    attempt_number = u.attempt_number,
+    updated_at = CURRENT_TIMESTAMP();
+
+-- ===================================
+-- Validation Queries
+-- ===================================
+
+-- 1. Compaction ratio (events in vs rows applied)
+SELECT
+  (SELECT COUNT(*) FROM `grand-jigsaw-476820-t1.payment_gateway_bronze.raw_transaction_updates`) as events_in,
+  (SELECT COUNT(*) FROM `grand-jigsaw-476820-t1.payment_gateway_silver.compacted_transaction_updates`) as events_after_compaction;
+
+-- 2. Orphan events (update for a transaction not in the fact table)
+SELECT COUNT(*) as orphan_events
+FROM `grand-jigsaw-476820-t1.payment_gateway_silver.compacted_transaction_updates` u
+LEFT JOIN `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions` f
+  ON u.transaction_id = f.transaction_id
+WHERE f.transaction_id IS NULL;
+-- Expected: 0 rows (every event targets a generator transaction)
+-- If ~all events: silver/fact were built from the Kaggle CSV, not the generator
+
+-- 3. Stale events (older than the row they target, skipped)
+SELECT COUNT(*) as stale_events
+FROM `grand-jigsaw-476820-t1.payment_gateway_silver.compacted_transaction_updates` u
+JOIN `grand-jigsaw-476820-t1.payment_gateway_silver.cleaned_transactions` s
+  ON u.transaction_id = s.transaction_id
+WHERE u.updated_at < s.updated_at;
+-- Expected: 0 on a fresh build (silver only ever moves forward)
+
+-- 4. Fact state after apply
+SELECT
+  COUNTIF(is_refunded) as refunded_transactions,
+  CAST(SUM(refund_amount_paise) AS NUMERIC) / 100 as total_refund_amount,
+  COUNTIF(attempt_number > 1) as retried_transactions,
+  CAST(SUM(cashback_amount_paise) AS NUMERIC) / 100 as total_cashback
+FROM `grand-jigsaw-476820-t1.payment_gateway_gold.fact_transactions`;